@@ -1,10 +1,46 @@
+from typing import Any, Callable, TypeVar, Union
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from starlette.concurrency import run_in_threadpool
 from .config import settings
+from .utils.pool_metrics import PoolMetrics, instrumented_pool_class, pool_stats
+
+T = TypeVar("T")
+
+# Async drivers used when DATABASE_ASYNC is enabled
+ASYNC_DRIVERS = {
+    "postgresql": "asyncpg",
+    "sqlite": "aiosqlite",
+}
+
+
+def engine_options(url: str, name: str, async_mode: bool = False) -> dict:
+    """Pool settings from Settings, with checkout instrumentation"""
+    options = {
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+    }
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:"):
+        # In-memory SQLite uses a single shared connection, there is nothing to size
+        return options
+
+    base = AsyncAdaptedQueuePool if async_mode else QueuePool
+    options.update(
+        poolclass=instrumented_pool_class(base, PoolMetrics(name)),
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+    )
+    return options
+
 
 # Create database engine
-engine = create_engine(settings.DATABASE_URL)
+engine = create_engine(settings.DATABASE_URL, **engine_options(settings.DATABASE_URL, "sync"))
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -13,10 +49,65 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 
-def get_db():
-    """Dependency for getting database session"""
-    db = SessionLocal()
+def async_database_url(url: str) -> str:
+    """Swap the sync driver in a database URL for its asyncio counterpart"""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for '{backend}' databases")
+    return parsed.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}").render_as_string(hide_password=False)
+
+
+# Async engine and session factory, only built when the async mode is enabled
+async_engine = None
+AsyncSessionLocal = None
+if settings.DATABASE_ASYNC:
+    async_url = async_database_url(settings.DATABASE_URL)
+    async_engine = create_async_engine(async_url, **engine_options(async_url, "async", async_mode=True))
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+
+def database_pool_stats() -> dict:
+    """Connection pool state and checkout metrics for this worker's engines"""
+    engines = {"sync": engine}
+    if async_engine is not None:
+        engines["async"] = async_engine.sync_engine
+    return pool_stats(engines)
+
+
+class ThreadpoolSession:
+    """
+    Gives a sync Session the `run_sync` interface of AsyncSession.
+
+    Routes hand their ORM code to `await db.run_sync(fn, ...)` and never
+    need to know which mode is active: here it runs on Starlette's
+    threadpool, under DATABASE_ASYNC it runs on the event loop via the
+    async driver.
+    """
+
+    def __init__(self, session: Session):
+        self.sync_session = session
+
+    async def run_sync(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        return await run_in_threadpool(fn, self.sync_session, *args, **kwargs)
+
+    async def close(self) -> None:
+        await run_in_threadpool(self.sync_session.close)
+
+
+async def get_db():
+    """Dependency for getting a database session (sync or async per settings)"""
+    if AsyncSessionLocal is not None:
+        async with AsyncSessionLocal() as db:
+            yield db
+        return
+
+    db = ThreadpoolSession(SessionLocal())
     try:
         yield db
     finally:
-        db.close()
+        await db.close()
+
+
+# Type of the object yielded by get_db, for route annotations
+DbSession = Union[AsyncSession, ThreadpoolSession]
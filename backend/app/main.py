@@ -1,37 +1,58 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, status
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy.exc import SQLAlchemyError
 from .config import settings
-from .database import engine, Base
+from .database import SessionLocal, async_engine, database_pool_stats, engine
 from .routes import auth, users, foods, meals, seed
+from .utils.catalog_cache import catalog_cache
+from .utils.compression import CompressionMiddleware
+from .utils.food_search import food_index
+from .utils.password_pool import HashingUnavailable, password_pool
+from .utils.request_metrics import PROMETHEUS_CONTENT_TYPE, MetricsMiddleware, request_metrics
+from .utils.sql_profiler import DB_QUERIES_HEADER, DB_TIME_HEADER, QueryProfileMiddleware, install_slow_query_log
+from .utils.user_cache import user_cache
+
+
+def hashing_unavailable_handler(request: Request, exc: HashingUnavailable):
+    """Shed auth load instead of queueing it behind the bcrypt pool"""
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": f"{exc}, please retry shortly"},
+        headers={"Retry-After": "1"},
+    )
+
+
+def build_food_index():
+    """Build the in-memory food search index before serving requests"""
+    db = SessionLocal()
+    try:
+        food_index.rebuild(db)
+    except SQLAlchemyError as e:
+        raise RuntimeError(
+            "Could not load the food catalog. Is the database reachable and "
+            "initialised (python scripts/init_db.py)?"
+        ) from e
+    finally:
+        db.close()
+
+
+def warm_catalog_cache():
+    """Encode the full catalog response up front so no request has to"""
+    catalog_cache.warm()
+
+
+def stop_password_pool():
+    password_pool.shutdown()
+
+
+async def dispose_engines():
+    """Close pooled connections; aiosqlite's connection threads would otherwise keep the worker alive"""
+    if async_engine is not None:
+        await async_engine.dispose()
+    engine.dispose()
+
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
-
-# Initialize FastAPI app
-app = FastAPI(
-    title="Calorie Tracker API",
-    description="API for tracking calorie intake from Indian foods",
-    version="1.0.0"
-)
-
-# Configure CORS - allow all origins for public API
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=False,  # Must be False when using "*"
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-# Include routers
-app.include_router(auth.router)
-app.include_router(users.router)
-app.include_router(foods.router)
-app.include_router(meals.router)
-app.include_router(seed.router)
-
-
-@app.get("/")
 def root():
     """Health check endpoint"""
     return {
@@ -41,7 +62,73 @@ def root():
     }
 
 
-@app.get("/health")
 def health_check():
     """Health check endpoint"""
-    return {"status": "healthy"}
+    return {
+        "status": "healthy",
+        "user_cache": user_cache.stats(),
+        "password_pool": password_pool.stats(),
+        "db_pool": database_pool_stats(),
+    }
+
+
+async def metrics():
+    """Prometheus scrape endpoint (async so it reads the metrics on the event loop that writes them)"""
+    return Response(request_metrics.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
+def create_app() -> FastAPI:
+    """
+    Build the API application.
+
+    Nothing here touches the database: the schema is managed by
+    scripts/init_db.py, and the only startup work is building the food index
+    and the encoded catalog.
+    """
+    app = FastAPI(
+        title="Calorie Tracker API",
+        description="API for tracking calorie intake from Indian foods",
+        version="1.0.0",
+        # Routes that still return models are validated as before, then
+        # encoded by orjson instead of json.dumps
+        default_response_class=ORJSONResponse
+    )
+    
+    # Configure CORS - allow all origins for public API
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],
+        allow_credentials=False,  # Must be False when using "*"
+        allow_methods=["*"],
+        allow_headers=["*"],
+        expose_headers=["X-Next-Cursor", "ETag", DB_QUERIES_HEADER, DB_TIME_HEADER],
+    )
+    # Compresses whatever CORS and the routes produce; inside MetricsMiddleware
+    # so the metrics count the bytes actually sent
+    app.add_middleware(CompressionMiddleware)
+    # Inside MetricsMiddleware, whose per-request SQL counters it reports
+    app.add_middleware(QueryProfileMiddleware)
+    # Added last so it is outermost and times everything, CORS included
+    app.add_middleware(MetricsMiddleware)
+    install_slow_query_log()
+    
+    # Include routers
+    app.include_router(auth.router)
+    app.include_router(users.router)
+    app.include_router(foods.router)
+    app.include_router(meals.router)
+    app.include_router(seed.router)
+    
+    app.add_exception_handler(HashingUnavailable, hashing_unavailable_handler)
+    app.add_event_handler("startup", build_food_index)
+    app.add_event_handler("startup", warm_catalog_cache)
+    app.add_event_handler("shutdown", stop_password_pool)
+    app.add_event_handler("shutdown", dispose_engines)
+    
+    app.add_api_route("/", root, methods=["GET"])
+    app.add_api_route("/health", health_check, methods=["GET"])
+    app.add_api_route("/metrics", metrics, methods=["GET"], include_in_schema=False)
+    return app
+
+
+app = create_app()
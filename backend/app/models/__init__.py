@@ -1,5 +1,7 @@
 from .user import User
 from .food import Food
 from .meal import Meal
+from .catalog import CatalogVersion
+from .rollup import DailyNutritionTotal
 
-__all__ = ["User", "Food", "Meal"]
+__all__ = ["User", "Food", "Meal", "CatalogVersion", "DailyNutritionTotal"]
@@ -0,0 +1,10 @@
+from sqlalchemy import Column, Integer
+from ..database import Base
+
+
+class CatalogVersion(Base):
+    """Single-row counter bumped on every write to the foods table"""
+    __tablename__ = "catalog_version"
+    
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
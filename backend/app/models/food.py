@@ -8,7 +8,7 @@ class Food(Base):
     __tablename__ = "foods"
     
     id = Column(Integer, primary_key=True, index=True)
-    name = Column(String, index=True, nullable=False)
+    name = Column(String, unique=True, index=True, nullable=False)
     calories_per_unit = Column(Float, nullable=False)
     protein_g = Column(Float, default=0.0)
     carbs_g = Column(Float, default=0.0)
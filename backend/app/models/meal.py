@@ -1,12 +1,18 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from ..database import Base
 
+MEAL_TYPES = ["breakfast", "lunch", "dinner", "snacks"]
+
 
 class Meal(Base):
     """Meal logging model"""
     __tablename__ = "meals"
+    __table_args__ = (
+        # Serves every "this user's meals between two timestamps" query
+        Index("ix_meals_user_id_logged_at", "user_id", "logged_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -17,4 +23,5 @@ class Meal(Base):
     
     # Relationships
     user = relationship("User", back_populates="meals")
-    food = relationship("Food", back_populates="meals")
+    # Every meal listing needs its food, so load both in one joined SELECT
+    food = relationship("Food", back_populates="meals", lazy="joined", innerjoin=True)
@@ -0,0 +1,16 @@
+from sqlalchemy import Column, Integer, String, Float, Date, ForeignKey
+from ..database import Base
+
+
+class DailyNutritionTotal(Base):
+    """Per-user, per-day, per-meal-type nutrition totals kept in step with meals"""
+    __tablename__ = "daily_nutrition_totals"
+    
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    meal_type = Column(String, primary_key=True)
+    calories = Column(Float, nullable=False, default=0.0)
+    protein_g = Column(Float, nullable=False, default=0.0)
+    carbs_g = Column(Float, nullable=False, default=0.0)
+    fats_g = Column(Float, nullable=False, default=0.0)
+    meal_count = Column(Integer, nullable=False, default=0)
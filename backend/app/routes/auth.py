@@ -1,53 +1,66 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
-from ..database import get_db
+from typing import Optional
+from ..database import DbSession, get_db
 from ..models.user import User
 from ..schemas.user import UserCreate, UserLogin, Token
-from ..utils.auth import hash_password, verify_password, create_access_token
+from ..utils.auth import hash_password_async, verify_password_async, create_access_token
+from ..utils.sql_profiler import query_budget
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
 
+def _find_user(db: Session, email: str) -> Optional[User]:
+    return db.query(User).filter(User.email == email).first()
+
+
+def _create_user(db: Session, user_data: UserCreate, hashed_pw: str) -> int:
+    new_user = User(
+        email=user_data.email,
+        hashed_password=hashed_pw,
+        daily_calorie_goal=user_data.daily_calorie_goal
+    )
+    
+    db.add(new_user)
+    db.commit()
+    db.refresh(new_user)
+    return new_user.id
+
+
 @router.post("/signup", response_model=Token, status_code=status.HTTP_201_CREATED)
-def signup(user_data: UserCreate, db: Session = Depends(get_db)):
+@query_budget(3)
+async def signup(user_data: UserCreate, db: DbSession = Depends(get_db)):
     """
     Register a new user
     """
     # Check if user already exists
-    existing_user = db.query(User).filter(User.email == user_data.email).first()
+    existing_user = await db.run_sync(_find_user, user_data.email)
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
     
-    # Create new user
-    hashed_pw = hash_password(user_data.password)
-    new_user = User(
-        email=user_data.email,
-        hashed_password=hashed_pw,
-        daily_calorie_goal=user_data.daily_calorie_goal
-    )
-    
-    db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    # Create new user (bcrypt runs on its own pool, off the request path)
+    hashed_pw = await hash_password_async(user_data.password)
+    user_id = await db.run_sync(_create_user, user_data, hashed_pw)
     
     # Create access token
-    access_token = create_access_token(data={"sub": str(new_user.id)})
+    access_token = create_access_token(data={"sub": str(user_id)})
     
     return {"access_token": access_token, "token_type": "bearer"}
 
 
 @router.post("/login", response_model=Token)
-def login(credentials: UserLogin, db: Session = Depends(get_db)):
+@query_budget(1)
+async def login(credentials: UserLogin, db: DbSession = Depends(get_db)):
     """
     Login and get JWT token
     """
     # Find user by email
-    user = db.query(User).filter(User.email == credentials.email).first()
+    user = await db.run_sync(_find_user, credentials.email)
     
-    if not user or not verify_password(credentials.password, user.hashed_password):
+    if not user or not await verify_password_async(credentials.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
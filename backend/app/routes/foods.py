@@ -1,29 +1,144 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from ..database import get_db
+from ..database import DbSession, get_db
 from ..models.food import Food
-from ..models.user import User
 from ..schemas.food import FoodResponse
+from ..utils.catalog_binary import CATALOG_BINARY_MEDIA_TYPE, accepts_binary_catalog, encode_catalog
+from ..utils.catalog_cache import catalog_cache
+from ..utils.compression import choose_encoding
 from ..utils.dependencies import get_current_user
+from ..utils.user_cache import CachedUser
+from ..utils.food_search import FOOD_FIELDS, food_index
+from ..utils.request_metrics import add_bytes_saved
+from ..utils.sql_profiler import query_budget
 
 router = APIRouter(prefix="/foods", tags=["Foods"])
 
+# Header carrying the keyset cursor for the next page
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
 
-@router.get("", response_model=List[FoodResponse])
-def get_foods(
+MAX_PAGE_SIZE = 500
+
+
+def parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """Validate a comma-separated projection; `id` is always included"""
+    if not fields:
+        return None
+
+    requested = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = [field for field in requested if field not in FoodResponse.model_fields]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(unknown)}"
+        )
+
+    projected = ["id"]
+    for field in requested:
+        if field not in projected:
+            projected.append(field)
+    return projected
+
+
+async def catalog_response(request: Request, db: DbSession, binary: bool) -> Response:
+    """Serve the full catalog from pre-encoded bytes, honouring If-None-Match"""
+    entry = await db.run_sync(catalog_cache.get)
+    encoding = choose_encoding(request.headers.get("accept-encoding", ""))
+    etag, body = entry.variant(binary, encoding)
+    headers = {
+        "ETag": etag,
+        "Cache-Control": "private, no-cache",
+        "Vary": "Accept, Accept-Encoding",
+    }
+
+    if entry.matches(request.headers.get("if-none-match"), binary):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    if encoding:
+        headers["Content-Encoding"] = encoding
+        add_bytes_saved(request.scope, len(entry.variant(binary, None)[1]) - len(body))
+    media_type = CATALOG_BINARY_MEDIA_TYPE if binary else "application/json"
+    return Response(body, media_type=media_type, headers=headers)
+
+
+def list_foods(db: Session, projection: Optional[List[str]], after: Optional[int], limit: Optional[int]):
+    """One page of the catalog ordered by id, as rows of the projected (or all) columns"""
+    # Push the projection down into the SELECT so unused columns are never
+    # loaded, and select plain columns so no ORM objects are built
+    columns = projection or FOOD_FIELDS
+    query = db.query(*[getattr(Food, field) for field in columns])
+
+    if after is not None:
+        query = query.filter(Food.id > after)
+    query = query.order_by(Food.id)
+    if limit is not None:
+        query = query.limit(limit)
+
+    return query.all()
+
+
+@router.get(
+    "",
+    response_model=List[FoodResponse],
+    responses={200: {"content": {CATALOG_BINARY_MEDIA_TYPE: {}}, "description": "JSON, or the compact catalog on request"}}
+)
+@query_budget(3)
+async def get_foods(
+    request: Request,
     search: Optional[str] = Query(None, description="Search term to filter foods by name"),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Maximum number of foods to return"),
+    after: Optional[int] = Query(None, description="Return foods with an id greater than this cursor"),
+    fields: Optional[str] = Query(None, description="Comma-separated list of fields to return, e.g. id,name,calories_per_unit"),
+    db: DbSession = Depends(get_db),
+    current_user: CachedUser = Depends(get_current_user)
 ):
     """
-    Get all foods with optional search filter
+    Get all foods with optional search filter.
+
+    Without a search term the catalog is paged by id: pass `limit` and then
+    the `X-Next-Cursor` response header as `after` to fetch the next page.
+    The unfiltered catalog is served with an ETag and answers 304 when the
+    client already has the current version.
+
+    Clients that send `Accept: application/vnd.calorie-tracker.catalog` get
+    unprojected results in the compact columnar format instead of JSON.
     """
-    query = db.query(Food)
-    
-    # Apply search filter if provided
+    projection = parse_fields(fields)
+    binary = projection is None and accepts_binary_catalog(request.headers.get("accept", ""))
+
+    if not search and limit is None and after is None and projection is None:
+        return await catalog_response(request, db, binary)
+
+    # Searches are answered from the in-memory index, best matches first.
+    # Index rows and column tuples are already FoodResponse-shaped, so they
+    # are encoded directly instead of being re-validated against the model.
     if search:
-        query = query.filter(Food.name.ilike(f"%{search}%"))
-    
-    foods = query.all()
-    return foods
+        if after is not None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Cursor pagination is not supported together with search"
+            )
+        if food_index.needs_check:
+            await db.run_sync(food_index.ensure_fresh)
+        foods = food_index.search(search, limit=limit)
+        if projection:
+            return ORJSONResponse([{field: food[field] for field in projection} for food in foods])
+        if binary:
+            return Response(encode_catalog(foods), media_type=CATALOG_BINARY_MEDIA_TYPE, headers={"Vary": "Accept"})
+        return ORJSONResponse(foods, headers={"Vary": "Accept"})
+
+    rows = await db.run_sync(list_foods, projection, after, limit)
+
+    # A full page means there may be more; hand back the last id as the cursor
+    headers = {}
+    if limit is not None and len(rows) == limit:
+        headers[NEXT_CURSOR_HEADER] = str(rows[-1].id)
+
+    columns = projection or FOOD_FIELDS
+    foods = [dict(zip(columns, row)) for row in rows]
+    headers["Vary"] = "Accept"
+    if binary:
+        return Response(encode_catalog(foods), media_type=CATALOG_BINARY_MEDIA_TYPE, headers=headers)
+    return ORJSONResponse(foods, headers=headers)
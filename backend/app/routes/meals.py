@@ -1,27 +1,139 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile, status
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import delete, insert
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from datetime import datetime, date
-from typing import List
-from ..database import get_db
-from ..models.meal import Meal
+from datetime import datetime, date, time, timedelta
+from typing import Dict, List, Optional
+from ..database import DbSession, get_db
+from ..models.meal import MEAL_TYPES, Meal
 from ..models.food import Food
-from ..models.user import User
-from ..schemas.meal import MealCreate, MealResponse, DailyStatsResponse
+from ..schemas.meal import (
+    MealCreate, MealResponse, MealCreateResponse, MealBatchRequest, MealBatchResponse, DayTotals,
+    MealImportResponse, DailyStatsResponse, DashboardResponse, RangeStatsResponse
+)
 from ..utils.dependencies import get_current_user
+from ..utils.meal_export import EXPORT_FORMATS, meal_export_stream
+from ..utils.meal_import import import_format, import_meals_file
+from ..utils.serialization import meals_payload
+from ..utils.user_cache import CachedUser
+from ..utils.rollups import (
+    GRANULARITIES, MACRO_COLUMNS, add_meal_delta, apply_meal_to_rollup, apply_rollup_delta,
+    count_buckets, get_day_totals, get_range_totals, meal_deltas
+)
+from ..utils.sql_profiler import query_budget
 
 router = APIRouter(prefix="/meals", tags=["Meals"])
 
+VALID_MEAL_TYPES = MEAL_TYPES
 
-@router.post("", response_model=MealResponse, status_code=status.HTTP_201_CREATED)
-def create_meal(
+# Upper bound on buckets per range request, e.g. just over a year of days
+MAX_RANGE_BUCKETS = 400
+
+# Upper bound on creates + deletes in one batch request
+MAX_BATCH_SIZE = 200
+
+
+def day_bounds(day: date):
+    """Half-open [start, end) timestamp range covering one calendar day"""
+    start = datetime.combine(day, time.min)
+    return start, start + timedelta(days=1)
+
+
+def validate_meal_type(meal_type: str) -> None:
+    if meal_type.lower() not in VALID_MEAL_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Meal type must be one of: {', '.join(VALID_MEAL_TYPES)}"
+        )
+
+
+def day_totals(db: Session, current_user: CachedUser, day: date) -> DayTotals:
+    """Running totals for one day, read from the rollup table"""
+    totals = get_day_totals(db, current_user.id, day)
+    return DayTotals(
+        day=day,
+        total_calories=round(totals["calories"], 2),
+        total_protein=round(totals["protein_g"], 2),
+        total_carbs=round(totals["carbs_g"], 2),
+        total_fats=round(totals["fats_g"], 2),
+        daily_goal=current_user.daily_calorie_goal,
+        remaining_calories=round(current_user.daily_calorie_goal - totals["calories"], 2)
+    )
+
+
+def todays_meals(db: Session, current_user: CachedUser) -> List[Meal]:
+    """Today's meals with their foods, in one joined SELECT"""
+    day_start, day_end = day_bounds(date.today())
+    return db.query(Meal).filter(
+        Meal.user_id == current_user.id,
+        Meal.logged_at >= day_start,
+        Meal.logged_at < day_end
+    ).all()
+
+
+def daily_stats_payload(current_user: CachedUser, meals: List[Meal], totals: Dict[str, float]) -> dict:
+    """DailyStatsResponse-shaped dict, served without re-validation"""
+    meals_by_type = {
+        "breakfast": [],
+        "lunch": [],
+        "dinner": [],
+        "snacks": []
+    }
+    
+    for meal in meals:
+        quantity = meal.quantity
+        food = meal.food
+        
+        # Group by meal type
+        meal_info = {
+            "id": meal.id,
+            "food_name": food.name,
+            "quantity": quantity,
+            "unit": food.unit_type,
+            "calories": food.calories_per_unit * quantity
+        }
+        meals_by_type[meal.meal_type].append(meal_info)
+    
+    # Calculate remaining calories
+    remaining_calories = current_user.daily_calorie_goal - totals["calories"]
+    
+    return {
+        "total_calories": round(totals["calories"], 2),
+        "total_protein": round(totals["protein_g"], 2),
+        "total_carbs": round(totals["carbs_g"], 2),
+        "total_fats": round(totals["fats_g"], 2),
+        "daily_goal": current_user.daily_calorie_goal,
+        "remaining_calories": round(remaining_calories, 2),
+        "meals_by_type": meals_by_type
+    }
+
+
+@router.post(
+    "",
+    response_model=MealCreateResponse,
+    response_model_exclude_none=True,
+    status_code=status.HTTP_201_CREATED
+)
+@query_budget(6)
+async def create_meal(
     meal_data: MealCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    include_totals: bool = Query(False, description="Also return the meal's day totals, updated"),
+    db: DbSession = Depends(get_db),
+    current_user: CachedUser = Depends(get_current_user)
 ):
     """
     Log a meal
+
+    With `include_totals=true` the response carries the day's updated
+    totals, so clients don't need to refetch today's stats.
     """
+    return await db.run_sync(_create_meal, meal_data, current_user, include_totals)
+
+
+def _create_meal(
+    db: Session, meal_data: MealCreate, current_user: CachedUser, include_totals: bool = False
+) -> MealCreateResponse:
     # Verify food exists
     food = db.query(Food).filter(Food.id == meal_data.food_id).first()
     if not food:
@@ -31,12 +143,7 @@ def create_meal(
         )
     
     # Validate meal type
-    valid_meal_types = ["breakfast", "lunch", "dinner", "snacks"]
-    if meal_data.meal_type.lower() not in valid_meal_types:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Meal type must be one of: {', '.join(valid_meal_types)}"
-        )
+    validate_meal_type(meal_data.meal_type)
     
     # Create meal log
     new_meal = Meal(
@@ -47,6 +154,13 @@ def create_meal(
     )
     
     db.add(new_meal)
+    db.flush()
+    
+    # Keep the daily rollup in the same transaction as the meal row
+    day = new_meal.logged_at.date()
+    apply_meal_to_rollup(db, current_user.id, day, new_meal.meal_type, food, new_meal.quantity)
+    # Read back before committing, so the totals include exactly this write
+    totals = day_totals(db, current_user, day) if include_totals else None
     db.commit()
     db.refresh(new_meal)
     
@@ -54,117 +168,318 @@ def create_meal(
     total_calories = food.calories_per_unit * meal_data.quantity
     
     # Prepare response
-    response = MealResponse(
+    response = MealCreateResponse(
         id=new_meal.id,
         food=food,
         meal_type=new_meal.meal_type,
         quantity=new_meal.quantity,
         logged_at=new_meal.logged_at,
-        total_calories=total_calories
+        total_calories=total_calories,
+        totals=totals
     )
     
     return response
 
 
-@router.get("/today", response_model=List[MealResponse])
-def get_todays_meals(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+@router.post("/batch", response_model=MealBatchResponse)
+async def batch_meals(
+    batch: MealBatchRequest,
+    db: DbSession = Depends(get_db),
+    current_user: CachedUser = Depends(get_current_user)
 ):
     """
-    Get all meals logged today
+    Log and delete several meals in one transaction
+
+    Returns the updated totals of every day the batch touched.
     """
-    today = date.today()
-    meals = db.query(Meal).filter(
-        Meal.user_id == current_user.id,
-        func.date(Meal.logged_at) == today
-    ).all()
+    if len(batch.create) + len(batch.delete) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MAX_BATCH_SIZE} creates and deletes per batch"
+        )
+    for meal_data in batch.create:
+        validate_meal_type(meal_data.meal_type)
     
-    # Build response with calculated calories
-    response = []
-    for meal in meals:
-        total_calories = meal.food.calories_per_unit * meal.quantity
-        response.append(MealResponse(
-            id=meal.id,
-            food=meal.food,
-            meal_type=meal.meal_type,
-            quantity=meal.quantity,
-            logged_at=meal.logged_at,
-            total_calories=total_calories
-        ))
+    return await db.run_sync(_batch_meals, batch, current_user)
+
+
+def _batch_meals(db: Session, batch: MealBatchRequest, current_user: CachedUser) -> MealBatchResponse:
+    pending_rollups = {}
     
-    return response
+    # Verify every referenced food with a single IN query
+    food_ids = {meal_data.food_id for meal_data in batch.create}
+    foods = {food.id: food for food in db.query(Food).filter(Food.id.in_(food_ids))} if food_ids else {}
+    missing_foods = sorted(food_ids - foods.keys())
+    if missing_foods:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Food not found: {', '.join(map(str, missing_foods))}"
+        )
+    
+    # Load the meals to delete (with their foods) to back them out of the rollups
+    delete_ids = set(batch.delete)
+    deleted = []
+    if delete_ids:
+        meals = db.query(Meal).filter(
+            Meal.id.in_(delete_ids),
+            Meal.user_id == current_user.id
+        ).all()
+        missing_meals = sorted(delete_ids - {meal.id for meal in meals})
+        if missing_meals:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Meal not found or unauthorized: {', '.join(map(str, missing_meals))}"
+            )
+        for meal in meals:
+            add_meal_delta(pending_rollups, meal.logged_at.date(), meal.meal_type, meal.food, meal.quantity, sign=-1)
+        db.execute(
+            delete(Meal)
+            .where(Meal.id.in_(delete_ids), Meal.user_id == current_user.id)
+            .execution_options(synchronize_session=False)
+        )
+        deleted = sorted(delete_ids)
+    
+    # Bulk insert all new meals in one statement; RETURNING carries each row's
+    # own values so nothing depends on the order the database returns them in
+    created = []
+    if batch.create:
+        logged_at = datetime.utcnow()
+        rows = [
+            {
+                "user_id": current_user.id,
+                "food_id": meal_data.food_id,
+                "meal_type": meal_data.meal_type.lower(),
+                "quantity": meal_data.quantity,
+                "logged_at": logged_at,
+            }
+            for meal_data in batch.create
+        ]
+        inserted = db.execute(
+            insert(Meal).returning(Meal.id, Meal.food_id, Meal.meal_type, Meal.quantity),
+            rows
+        ).all()
+        for meal_id, food_id, meal_type, quantity in sorted(inserted):
+            food = foods[food_id]
+            add_meal_delta(pending_rollups, logged_at.date(), meal_type, food, quantity)
+            created.append(MealResponse(
+                id=meal_id,
+                food=food,
+                meal_type=meal_type,
+                quantity=quantity,
+                logged_at=logged_at,
+                total_calories=food.calories_per_unit * quantity
+            ))
+    
+    # One rollup write per touched (day, meal_type); the totals of each touched
+    # day are read before the commit so they reflect exactly this batch
+    for (day, meal_type), deltas in pending_rollups.items():
+        apply_rollup_delta(db, current_user.id, day, meal_type, deltas)
+    totals = [day_totals(db, current_user, day) for day in sorted({day for day, _ in pending_rollups})]
+    db.commit()
+    
+    return MealBatchResponse(created=created, deleted=deleted, totals=totals)
+
+
+@router.get("/today", response_model=List[MealResponse])
+@query_budget(2)
+async def get_todays_meals(
+    db: DbSession = Depends(get_db),
+    current_user: CachedUser = Depends(get_current_user)
+):
+    """
+    Get all meals logged today
+    """
+    return ORJSONResponse(await db.run_sync(_get_todays_meals, current_user))
+
+
+def _get_todays_meals(db: Session, current_user: CachedUser) -> List[dict]:
+    # Built here from our own rows, so it skips response_model validation
+    return meals_payload(todays_meals(db, current_user))
 
 
 @router.get("/stats/today", response_model=DailyStatsResponse)
-def get_daily_stats(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+@query_budget(3)
+async def get_daily_stats(
+    db: DbSession = Depends(get_db),
+    current_user: CachedUser = Depends(get_current_user)
 ):
     """
     Get today's calorie and nutrition statistics
     """
-    today = date.today()
-    meals = db.query(Meal).filter(
-        Meal.user_id == current_user.id,
-        func.date(Meal.logged_at) == today
-    ).all()
-    
-    # Calculate totals
-    total_calories = 0.0
-    total_protein = 0.0
-    total_carbs = 0.0
-    total_fats = 0.0
-    meals_by_type = {
-        "breakfast": [],
-        "lunch": [],
-        "dinner": [],
-        "snacks": []
-    }
+    return ORJSONResponse(await db.run_sync(_get_daily_stats, current_user))
+
+
+def _get_daily_stats(db: Session, current_user: CachedUser) -> dict:
+    meals = todays_meals(db, current_user)
+    # Totals come from the incrementally maintained rollup table
+    totals = get_day_totals(db, current_user.id, date.today())
+    return daily_stats_payload(current_user, meals, totals)
+
+
+@router.get("/dashboard/today", response_model=DashboardResponse)
+@query_budget(2)
+async def get_today_dashboard(
+    db: DbSession = Depends(get_db),
+    current_user: CachedUser = Depends(get_current_user)
+):
+    """
+    Get today's meals and statistics together, for the home screen
+    """
+    return ORJSONResponse(await db.run_sync(_get_today_dashboard, current_user))
+
+
+def _get_today_dashboard(db: Session, current_user: CachedUser) -> dict:
+    meals = todays_meals(db, current_user)
     
+    # Summed from the same rows as the list, so the day costs one query and
+    # the totals always agree with the meals shown next to them
+    totals = dict.fromkeys(MACRO_COLUMNS, 0.0)
     for meal in meals:
-        quantity = meal.quantity
-        food = meal.food
-        
-        # Accumulate totals
-        total_calories += food.calories_per_unit * quantity
-        total_protein += food.protein_g * quantity
-        total_carbs += food.carbs_g * quantity
-        total_fats += food.fats_g * quantity
-        
-        # Group by meal type
-        meal_info = {
-            "id": meal.id,
-            "food_name": food.name,
-            "quantity": quantity,
-            "unit": food.unit_type,
-            "calories": food.calories_per_unit * quantity
-        }
-        meals_by_type[meal.meal_type].append(meal_info)
+        for column, value in meal_deltas(meal.food, meal.quantity).items():
+            totals[column] += value
     
-    # Calculate remaining calories
-    remaining_calories = current_user.daily_calorie_goal - total_calories
+    return {
+        "meals": meals_payload(meals),
+        "stats": daily_stats_payload(current_user, meals, totals)
+    }
+
+
+@router.get("/stats/range", response_model=RangeStatsResponse)
+@query_budget(2)
+async def get_range_stats(
+    start: date = Query(..., alias="from", description="First day of the range (inclusive)"),
+    end: date = Query(..., alias="to", description="Last day of the range (inclusive)"),
+    granularity: str = Query("day", description="Bucket size: day, week or month"),
+    db: DbSession = Depends(get_db),
+    current_user: CachedUser = Depends(get_current_user)
+):
+    """
+    Get calorie and nutrition totals per day, week or month over a date range
+    """
+    if granularity not in GRANULARITIES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Granularity must be one of: {', '.join(GRANULARITIES)}"
+        )
+    if end < start:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="'to' must not be before 'from'"
+        )
+    if count_buckets(start, end, granularity) > MAX_RANGE_BUCKETS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Range too large: at most {MAX_RANGE_BUCKETS} {granularity} buckets per request"
+        )
     
-    return DailyStatsResponse(
-        total_calories=round(total_calories, 2),
-        total_protein=round(total_protein, 2),
-        total_carbs=round(total_carbs, 2),
-        total_fats=round(total_fats, 2),
+    buckets = await db.run_sync(get_range_totals, current_user.id, start, end, granularity)
+    
+    return RangeStatsResponse(
+        start=start,
+        end=end,
+        granularity=granularity,
         daily_goal=current_user.daily_calorie_goal,
-        remaining_calories=round(remaining_calories, 2),
-        meals_by_type=meals_by_type
+        buckets=[
+            {
+                "start": bucket["start"],
+                "total_calories": round(bucket["calories"], 2),
+                "total_protein": round(bucket["protein_g"], 2),
+                "total_carbs": round(bucket["carbs_g"], 2),
+                "total_fats": round(bucket["fats_g"], 2),
+                "meal_count": bucket["meal_count"],
+            }
+            for bucket in buckets
+        ]
     )
 
 
-@router.delete("/{meal_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_meal(
+@router.get("/export")
+async def export_meals(
+    format: str = Query("csv", description="Output format: csv or ndjson"),
+    start: Optional[date] = Query(None, alias="from", description="First day to include"),
+    end: Optional[date] = Query(None, alias="to", description="Last day to include"),
+    current_user: CachedUser = Depends(get_current_user)
+):
+    """
+    Download the full meal history as CSV or NDJSON, streamed row batch by row batch
+    """
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Format must be one of: {', '.join(EXPORT_FORMATS)}"
+        )
+    if start is not None and end is not None and end < start:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="'to' must not be before 'from'"
+        )
+    
+    # The stream opens its own session, so no request-scoped one is held here
+    return StreamingResponse(
+        meal_export_stream(
+            format,
+            current_user.id,
+            day_bounds(start)[0] if start is not None else None,
+            day_bounds(end)[1] if end is not None else None,
+        ),
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="meals.{format}"'}
+    )
+
+
+@router.post("/import", response_model=MealImportResponse)
+async def import_meals(
+    file: UploadFile = File(..., description="CSV or NDJSON meal log"),
+    format: Optional[str] = Query(None, description="csv or ndjson; guessed from the file name if omitted"),
+    current_user: CachedUser = Depends(get_current_user)
+):
+    """
+    Bulk import historical meals from a CSV or NDJSON file
+
+    All or nothing for unreadable files: a 400 means no meal was imported.
+    """
+    try:
+        fmt = import_format(file.filename, format)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    # Parsing is CPU-bound and COPY needs a sync connection, so the import
+    # always runs on the threadpool with its own session
+    try:
+        return await run_in_threadpool(import_meals_file, file.file, fmt, current_user.id)
+    except UnicodeDecodeError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="File must be UTF-8 encoded"
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.delete(
+    "/{meal_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    responses={200: {"model": DayTotals, "description": "Deleted; the meal's day totals, with `include_totals=true`"}}
+)
+@query_budget(6)
+async def delete_meal(
     meal_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    include_totals: bool = Query(False, description="Answer 200 with the meal's day totals, updated"),
+    db: DbSession = Depends(get_db),
+    current_user: CachedUser = Depends(get_current_user)
 ):
     """
     Delete a meal log
     """
+    totals = await db.run_sync(_delete_meal, meal_id, current_user, include_totals)
+    if totals is not None:
+        return ORJSONResponse(totals.model_dump(mode="json"))
+    return None
+
+
+def _delete_meal(
+    db: Session, meal_id: int, current_user: CachedUser, include_totals: bool = False
+) -> Optional[DayTotals]:
     meal = db.query(Meal).filter(
         Meal.id == meal_id,
         Meal.user_id == current_user.id
@@ -176,7 +491,10 @@ def delete_meal(
             detail="Meal not found or unauthorized"
         )
     
+    day = meal.logged_at.date()
+    apply_meal_to_rollup(db, current_user.id, day, meal.meal_type, meal.food, meal.quantity, sign=-1)
     db.delete(meal)
+    # Read back before committing, so the totals include exactly this write
+    totals = day_totals(db, current_user, day) if include_totals else None
     db.commit()
-    
-    return None
+    return totals
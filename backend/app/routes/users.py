@@ -1,13 +1,15 @@
 from fastapi import APIRouter, Depends
-from ..models.user import User
 from ..schemas.user import UserResponse
 from ..utils.dependencies import get_current_user
+from ..utils.user_cache import CachedUser
+from ..utils.sql_profiler import query_budget
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
 
 @router.get("/me", response_model=UserResponse)
-def get_current_user_profile(current_user: User = Depends(get_current_user)):
+@query_budget(1)
+async def get_current_user_profile(current_user: CachedUser = Depends(get_current_user)):
     """
     Get current user profile
     """
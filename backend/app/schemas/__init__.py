@@ -1,9 +1,15 @@
 from .user import UserCreate, UserLogin, UserResponse, Token
 from .food import FoodBase, FoodResponse
-from .meal import MealCreate, MealResponse, DailyStatsResponse
+from .meal import (
+    MealCreate, MealResponse, MealBatchRequest, DayTotals, MealCreateResponse, MealBatchResponse,
+    MealImportError, MealImportResponse, DailyStatsResponse, DashboardResponse, StatsBucket,
+    RangeStatsResponse
+)
 
 __all__ = [
     "UserCreate", "UserLogin", "UserResponse", "Token",
     "FoodBase", "FoodResponse",
-    "MealCreate", "MealResponse", "DailyStatsResponse"
+    "MealCreate", "MealResponse", "MealBatchRequest", "DayTotals", "MealCreateResponse", "MealBatchResponse",
+    "MealImportError", "MealImportResponse",
+    "DailyStatsResponse", "DashboardResponse", "StatsBucket", "RangeStatsResponse"
 ]
@@ -1,6 +1,6 @@
 from pydantic import BaseModel
-from datetime import datetime
-from typing import Dict
+from datetime import datetime, date
+from typing import Dict, List, Optional
 from .food import FoodResponse
 
 
@@ -24,6 +24,50 @@ class MealResponse(BaseModel):
         from_attributes = True
 
 
+class MealBatchRequest(BaseModel):
+    """Schema for creating and deleting several meal logs at once"""
+    create: List[MealCreate] = []
+    delete: List[int] = []
+
+
+class DayTotals(BaseModel):
+    """Schema for one day's running totals"""
+    day: date
+    total_calories: float
+    total_protein: float
+    total_carbs: float
+    total_fats: float
+    daily_goal: int
+    remaining_calories: float
+
+
+class MealCreateResponse(MealResponse):
+    """Schema for a logged meal, with its day's updated totals when requested"""
+    totals: Optional[DayTotals] = None
+
+
+class MealBatchResponse(BaseModel):
+    """Schema for the result of a batch meal mutation"""
+    created: List[MealResponse]
+    deleted: List[int]
+    # One entry per day the batch created or deleted meals on, oldest first
+    totals: List[DayTotals]
+
+
+class MealImportError(BaseModel):
+    """One rejected row of a meal import"""
+    line: int
+    error: str
+
+
+class MealImportResponse(BaseModel):
+    """Schema for the result of a bulk meal import"""
+    imported: int
+    failed: int
+    errors: List[MealImportError]
+    errors_truncated: bool
+
+
 class DailyStatsResponse(BaseModel):
     """Schema for daily statistics"""
     total_calories: float
@@ -33,3 +77,28 @@ class DailyStatsResponse(BaseModel):
     daily_goal: int
     remaining_calories: float
     meals_by_type: Dict[str, list]
+
+
+class DashboardResponse(BaseModel):
+    """Schema for the home screen: today's meals and statistics together"""
+    meals: List[MealResponse]
+    stats: DailyStatsResponse
+
+
+class StatsBucket(BaseModel):
+    """Nutrition totals for one day, week or month"""
+    start: date
+    total_calories: float
+    total_protein: float
+    total_carbs: float
+    total_fats: float
+    meal_count: int
+
+
+class RangeStatsResponse(BaseModel):
+    """Schema for statistics over a date range"""
+    start: date
+    end: date
+    granularity: str
+    daily_goal: int
+    buckets: List[StatsBucket]
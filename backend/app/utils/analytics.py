@@ -0,0 +1,215 @@
+import threading
+import warnings
+from datetime import date, datetime, time, timedelta
+from typing import NamedTuple, Optional, Sequence
+import numpy as np
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import Session
+from ..models.food import Food
+from ..models.meal import MEAL_TYPES, Meal
+from .catalog_cache import get_catalog_version
+from .rollups import MACRO_COLUMNS
+
+# Small integer codes for meal types, indexing MEAL_TYPES
+MEAL_TYPE_CODES = {meal_type: code for code, meal_type in enumerate(MEAL_TYPES)}
+
+# Rows fetched per round trip while loading meals
+FETCH_BATCH_SIZE = 100_000
+
+# One loaded row, in the column order load_meal_arrays selects
+_ROW_DTYPE = np.dtype([
+    ("user_id", np.int64), ("day", "datetime64[D]"), ("meal_type", np.int8),
+    ("food_id", np.int64), ("quantity", np.float64),
+])
+
+# Daily percentiles reported by default
+DEFAULT_PERCENTILES = (10, 50, 90)
+
+
+class NutrientMatrix:
+    """
+    Nutrients per serving of every food as a (max food id + 1, 4) array.
+
+    Row i holds MACRO_COLUMNS for food id i (zeros for unused ids), so the
+    nutrients of N meals are one fancy-indexing gather. Keyed on the catalog
+    version like CatalogCache, so catalog writes from any process are seen.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version: Optional[int] = None
+        self._matrix: Optional[np.ndarray] = None
+
+    def get(self, db: Session) -> np.ndarray:
+        version = get_catalog_version(db)
+        matrix = self._matrix
+        if matrix is not None and self._version == version:
+            return matrix
+
+        with self._lock:
+            if self._matrix is None or self._version != version:
+                self._matrix = self.build(db)
+                self._version = version
+            return self._matrix
+
+    @staticmethod
+    def build(db: Session) -> np.ndarray:
+        # Same order as MACRO_COLUMNS
+        rows = db.query(Food.id, Food.calories_per_unit, Food.protein_g, Food.carbs_g, Food.fats_g).all()
+        matrix = np.zeros((max((row[0] for row in rows), default=0) + 1, len(MACRO_COLUMNS)))
+        if rows:
+            ids = np.array([row[0] for row in rows])
+            # NULL macros arrive as None, i.e. NaN in a float array
+            matrix[ids] = np.nan_to_num(np.array([row[1:] for row in rows], dtype=float))
+        return matrix
+
+
+# Process-wide matrix shared by analytics callers
+nutrient_matrix = NutrientMatrix()
+
+
+class MealArrays(NamedTuple):
+    """Meals as parallel columns, one entry per meal"""
+    user_id: np.ndarray    # int64
+    day: np.ndarray        # datetime64[D]
+    meal_type: np.ndarray  # int8 code into MEAL_TYPES
+    food_id: np.ndarray    # int64
+    quantity: np.ndarray   # float64
+
+    @classmethod
+    def empty(cls) -> "MealArrays":
+        return cls(
+            np.empty(0, np.int64), np.empty(0, "datetime64[D]"), np.empty(0, np.int8),
+            np.empty(0, np.int64), np.empty(0, np.float64),
+        )
+
+
+def load_meal_arrays(
+    db: Session, start: date, end: date, user_ids: Optional[Sequence[int]] = None
+) -> MealArrays:
+    """
+    Load every meal logged on days start..end (inclusive) into MealArrays, in batches.
+
+    The day and meal type code are computed in SQL and rows are read straight
+    off the DBAPI cursor into a structured array, so no SQLAlchemy Row or
+    datetime is built per meal; what is left per row is the driver's own
+    tuple. Even so, loading dominates: see benchmarks/bench_analytics.py.
+    """
+    stmt = select(
+        Meal.user_id,
+        func.date(Meal.logged_at),
+        case(MEAL_TYPE_CODES, value=Meal.meal_type),
+        Meal.food_id,
+        Meal.quantity,
+    ).where(
+        Meal.logged_at >= datetime.combine(start, time.min),
+        Meal.logged_at < datetime.combine(end + timedelta(days=1), time.min),
+    )
+    if user_ids is not None:
+        stmt = stmt.where(Meal.user_id.in_(user_ids))
+
+    parts = []
+    # No stream_results: a streaming result prefetches rows into its own
+    # buffer, which reading the DBAPI cursor directly would skip
+    result = db.connection().execute(stmt)
+    try:
+        # func.date() comes back as an ISO string (SQLite) or a date, both of
+        # which numpy parses into datetime64[D] itself
+        while rows := result.cursor.fetchmany(FETCH_BATCH_SIZE):
+            parts.append(np.array(rows, dtype=_ROW_DTYPE))
+    finally:
+        result.close()
+    if not parts:
+        return MealArrays.empty()
+    rows = np.concatenate(parts)
+    return MealArrays(*[np.ascontiguousarray(rows[field]) for field in MealArrays._fields])
+
+
+def meal_nutrients(meals: MealArrays, matrix: np.ndarray) -> np.ndarray:
+    """(MACRO_COLUMNS, meals) nutrients of each meal, one contiguous row per macro"""
+    return matrix.T[:, meals.food_id] * meals.quantity
+
+
+def _grouped_sums(key: np.ndarray, nutrients: np.ndarray, size: int) -> np.ndarray:
+    """(size, MACRO_COLUMNS) sums of each macro row of `nutrients` by integer bucket `key`"""
+    return np.stack([np.bincount(key, weights=row, minlength=size) for row in nutrients], axis=-1)
+
+
+def _user_index(user_id: np.ndarray):
+    """Distinct user ids (sorted) and each meal's position among them"""
+    # Ids are dense autoincrement keys, so a lookup table beats np.unique's sort
+    if len(user_id) and user_id.max() < 4 * len(user_id) + 1024:
+        present = np.bincount(user_id) > 0
+        user_ids = np.flatnonzero(present)
+        positions = np.cumsum(present) - 1
+        return user_ids, positions[user_id]
+    user_ids, index = np.unique(user_id, return_inverse=True)
+    return user_ids, index.reshape(-1)
+
+
+class DailyTotals(NamedTuple):
+    """Per-user, per-day totals over a contiguous range of days"""
+    user_ids: np.ndarray     # (users,)
+    days: np.ndarray         # (days,) datetime64[D]
+    totals: np.ndarray       # (users, days, MACRO_COLUMNS)
+    meal_counts: np.ndarray  # (users, days)
+
+
+def daily_totals(meals: MealArrays, matrix: np.ndarray, start: date, end: date) -> DailyTotals:
+    """
+    Sum nutrients per user and day with one bincount per macro.
+
+    Days with no meals are kept as zeros so the day axis is contiguous;
+    meal_counts tells logged days from empty ones.
+    """
+    days = np.arange(np.datetime64(start, "D"), np.datetime64(end, "D") + 1)
+    user_ids, user_index = _user_index(meals.user_id)
+    shape = (len(user_ids), len(days))
+
+    # One flat bucket per (user, day)
+    key = user_index * len(days) + (meals.day - days[0]).astype(np.int64)
+    size = shape[0] * shape[1]
+    totals = _grouped_sums(key, meal_nutrients(meals, matrix), size)
+    counts = np.bincount(key, minlength=size)
+    return DailyTotals(user_ids, days, totals.reshape(*shape, len(MACRO_COLUMNS)), counts.reshape(shape))
+
+
+def meal_type_totals(meals: MealArrays, matrix: np.ndarray) -> np.ndarray:
+    """(users in ascending id order, MEAL_TYPES, MACRO_COLUMNS) totals over all the given meals"""
+    user_ids, user_index = _user_index(meals.user_id)
+    key = user_index * len(MEAL_TYPES) + meals.meal_type
+    totals = _grouped_sums(key, meal_nutrients(meals, matrix), len(user_ids) * len(MEAL_TYPES))
+    return totals.reshape(len(user_ids), len(MEAL_TYPES), len(MACRO_COLUMNS))
+
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Trailing mean over `window` days along axis 1 (the day axis of DailyTotals).
+
+    The first window - 1 days average over the days available so far.
+    """
+    n_days = values.shape[1]
+    padding = np.zeros((values.shape[0], 1, *values.shape[2:]))
+    cumulative = np.concatenate([padding, np.cumsum(values, axis=1)], axis=1)
+    upper = np.arange(1, n_days + 1)
+    lower = np.maximum(upper - window, 0)
+    counts = (upper - lower).reshape(1, n_days, *[1] * (values.ndim - 2))
+    return (cumulative[:, upper] - cumulative[:, lower]) / counts
+
+
+def daily_percentiles(
+    daily: DailyTotals, percentiles: Sequence[float] = DEFAULT_PERCENTILES, logged_days_only: bool = True
+) -> np.ndarray:
+    """
+    (users, percentiles, MACRO_COLUMNS) percentiles of the daily totals.
+
+    By default days without any meal are left out, so unlogged days don't
+    read as zero-calorie days; users with no logged day get NaN.
+    """
+    totals = daily.totals
+    if logged_days_only:
+        totals = np.where(daily.meal_counts[..., None] > 0, totals, np.nan)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # "All-NaN slice"
+        result = np.nanpercentile(totals, percentiles, axis=1)
+    return np.moveaxis(result, 0, 1)
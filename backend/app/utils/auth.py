@@ -3,10 +3,10 @@ from typing import Optional
 from jose import JWTError, jwt
 import bcrypt
 from ..config import settings
+from .password_pool import password_pool
 
 
-def hash_password(password: str) -> str:
-    """Hash a password using bcrypt"""
+def _hash_password(password: str) -> str:
     # Encode password to bytes, truncate to 72 bytes (bcrypt limit)
     password_bytes = password.encode('utf-8')[:72]
     salt = bcrypt.gensalt()
@@ -14,8 +14,7 @@ def hash_password(password: str) -> str:
     return hashed.decode('utf-8')
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a password against its hash"""
+def _verify_password(plain_password: str, hashed_password: str) -> bool:
     try:
         password_bytes = plain_password.encode('utf-8')[:72]
         hashed_bytes = hashed_password.encode('utf-8')
@@ -24,6 +23,26 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         return False
 
 
+def hash_password(password: str) -> str:
+    """Hash a password using bcrypt on the dedicated password pool"""
+    return password_pool.run(_hash_password, password)
+
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password against its hash on the dedicated password pool"""
+    return password_pool.run(_verify_password, plain_password, hashed_password)
+
+
+async def hash_password_async(password: str) -> str:
+    """Like hash_password, but awaits the pool instead of blocking the caller"""
+    return await password_pool.run_async(_hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Like verify_password, but awaits the pool instead of blocking the caller"""
+    return await password_pool.run_async(_verify_password, plain_password, hashed_password)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token"""
     to_encode = data.copy()
@@ -0,0 +1,114 @@
+import struct
+import sys
+from array import array
+from itertools import accumulate
+from typing import Dict, Iterable, List
+
+# Opt-in compact catalog encoding, negotiated through the Accept header
+CATALOG_BINARY_MEDIA_TYPE = "application/vnd.calorie-tracker.catalog"
+
+CATALOG_MAGIC = b"FCAT"
+CATALOG_FORMAT_VERSION = 1
+
+# magic, format version, unit_type count, food count
+_HEADER = struct.Struct("<4sHHI")
+
+# Nutrient columns, in the order they follow the ids
+NUTRIENT_FIELDS = ("calories_per_unit", "protein_g", "carbs_g", "fats_g")
+
+
+def accepts_binary_catalog(accept: str) -> bool:
+    """True if the client listed the compact catalog media type in Accept (and not with q=0)"""
+    for part in accept.split(","):
+        media_type, *params = [item.strip() for item in part.split(";")]
+        if media_type == CATALOG_BINARY_MEDIA_TYPE:
+            return not any(param.replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000") for param in params)
+    return False
+
+
+def _column(typecode: str, values) -> bytes:
+    column = array(typecode, values)
+    if sys.byteorder == "big":
+        column.byteswap()
+    return column.tobytes()
+
+
+def _strings(values: List[str]) -> bytes:
+    """u16 byte lengths followed by the concatenated UTF-8"""
+    encoded = [value.encode("utf-8") for value in values]
+    return _column("H", [len(value) for value in encoded]) + b"".join(encoded)
+
+
+def encode_catalog(foods: Iterable[dict]) -> bytes:
+    """
+    Columnar, little-endian encoding of FoodResponse-shaped rows.
+
+    Layout (n foods, u unit types):
+        header        "FCAT", u16 version, u16 u, u32 n
+        ids           u32 * n
+        nutrients     f32 * n for each of NUTRIENT_FIELDS
+        unit_type     u16 * n, indexes into the unit table
+        unit table    u16 * u lengths, then UTF-8 bytes
+        name          u16 * n lengths, then UTF-8 bytes
+        description   u16 * n lengths, then UTF-8 bytes
+
+    The header is 12 bytes, so the u32/f32 columns are 4-byte aligned and
+    can be viewed in place as typed arrays. Nutrients are single precision;
+    clients round to two decimals, which recovers the stored values.
+    """
+    foods = list(foods)
+    units: Dict[str, int] = {}
+    unit_indexes = [units.setdefault(food["unit_type"], len(units)) for food in foods]
+
+    parts = [
+        _HEADER.pack(CATALOG_MAGIC, CATALOG_FORMAT_VERSION, len(units), len(foods)),
+        _column("I", [food["id"] for food in foods]),
+        *[_column("f", [food[field] for food in foods]) for field in NUTRIENT_FIELDS],
+        _column("H", unit_indexes),
+        _strings(list(units)),
+        _strings([food["name"] for food in foods]),
+        _strings([food["unit_size_description"] for food in foods]),
+    ]
+    return b"".join(parts)
+
+
+def decode_catalog_columns(data: bytes) -> Dict[str, list]:
+    """Decode into one list (or array) per FoodResponse field, the way a typed-array client would"""
+    magic, version, unit_count, count = _HEADER.unpack_from(data)
+    if magic != CATALOG_MAGIC or version != CATALOG_FORMAT_VERSION:
+        raise ValueError("Not a version 1 food catalog")
+    offset = _HEADER.size
+
+    def column(typecode: str, length: int) -> array:
+        nonlocal offset
+        values = array(typecode)
+        values.frombytes(data[offset:offset + length * values.itemsize])
+        if sys.byteorder == "big":
+            values.byteswap()
+        offset += length * values.itemsize
+        return values
+
+    def strings(length: int) -> List[str]:
+        nonlocal offset
+        ends = list(accumulate(column("H", length), initial=offset))
+        offset = ends[-1]
+        return [data[start:end].decode("utf-8") for start, end in zip(ends, ends[1:])]
+
+    columns = {"id": column("I", count)}
+    for field in NUTRIENT_FIELDS:
+        columns[field] = column("f", count)
+    unit_indexes = column("H", count)
+    units = strings(unit_count)
+    columns["unit_type"] = [units[index] for index in unit_indexes]
+    columns["name"] = strings(count)
+    columns["unit_size_description"] = strings(count)
+    return columns
+
+
+def decode_catalog(data: bytes) -> List[dict]:
+    """Reference decoder: FoodResponse-shaped dicts, nutrients rounded to 2 decimals"""
+    columns = decode_catalog_columns(data)
+    for field in NUTRIENT_FIELDS:
+        columns[field] = [round(value, 2) for value in columns[field]]
+    names = list(columns)
+    return [dict(zip(names, row)) for row in zip(*columns.values())]
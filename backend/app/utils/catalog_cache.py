@@ -0,0 +1,168 @@
+import hashlib
+import json
+import logging
+import threading
+from typing import Dict, NamedTuple, Optional, Tuple
+from sqlalchemy import event, update
+from sqlalchemy.orm import Session
+from ..config import settings
+from ..database import SessionLocal
+from ..models.catalog import CatalogVersion
+from ..models.food import Food
+from ..schemas.food import FoodResponse
+from .catalog_binary import encode_catalog
+from .compression import SUPPORTED_ENCODINGS, compress
+
+logger = logging.getLogger(__name__)
+
+CATALOG_VERSION_ID = 1
+
+
+def get_catalog_version(db: Session) -> int:
+    """Return the current catalog version (0 if the catalog was never written)"""
+    version = db.query(CatalogVersion.version).filter(
+        CatalogVersion.id == CATALOG_VERSION_ID
+    ).scalar()
+    return version or 0
+
+
+def bump_catalog_version(db: Session) -> None:
+    """Increment the catalog version as part of the caller's transaction"""
+    result = db.execute(
+        update(CatalogVersion)
+        .where(CatalogVersion.id == CATALOG_VERSION_ID)
+        .values(version=CatalogVersion.version + 1)
+    )
+    if result.rowcount == 0:
+        db.execute(
+            CatalogVersion.__table__.insert().values(id=CATALOG_VERSION_ID, version=1)
+        )
+
+
+@event.listens_for(Session, "before_flush")
+def _bump_on_food_write(session, flush_context, instances):
+    """Any ORM insert, update or delete of a Food invalidates cached catalogs"""
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, Food):
+            bump_catalog_version(session)
+            return
+
+
+class CatalogEntry(NamedTuple):
+    """Full catalog response encoded once per version, in every representation we serve"""
+    version: int
+    etag: str
+    # (compact binary?, content coding or None) -> body
+    bodies: Dict[Tuple[bool, Optional[str]], bytes]
+
+    def variant(self, binary: bool, encoding: Optional[str]) -> Tuple[str, bytes]:
+        """ETag and body of one representation"""
+        # Strong ETags must differ between encodings of the same content
+        suffix = ("-bin" if binary else "") + (f"-{encoding}" if encoding else "")
+        etag = self.etag[:-1] + suffix + '"' if suffix else self.etag
+        return etag, self.bodies[(binary, encoding)]
+
+    def matches(self, if_none_match: Optional[str], binary: bool) -> bool:
+        """
+        True if an If-None-Match header names this entry in the media type being served.
+
+        Any content coding of that media type counts, since the client decodes
+        before caching; a JSON tag never validates the binary catalog or back.
+        """
+        if not if_none_match:
+            return False
+        # If-None-Match uses the weak comparison
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or any(
+            self.variant(*key)[0] in tags for key in self.bodies if key[0] == binary
+        )
+
+
+class CatalogCache:
+    """
+    Keeps the full GET /foods response pre-encoded as JSON and as the
+    compact binary format, each plain and in every offered content coding.
+    Compressing once per version means catalog hits never pay compression
+    CPU, and CompressionMiddleware passes them through.
+
+    The entry is keyed on the catalog version, so a write from any process
+    (seed route, populate script) is picked up on the next request. Encoding
+    a large catalog takes seconds, so after a write the previous entry keeps
+    being served while a background thread builds the new one; only a cold
+    cache (warm() not run yet) is built on the request path, and no request
+    ever blocks on another's build.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._entry: Optional[CatalogEntry] = None
+        self._refreshing = False
+
+    def invalidate(self) -> None:
+        self._entry = None
+
+    def get(self, db: Session) -> CatalogEntry:
+        version = get_catalog_version(db)
+        entry = self._entry
+        if entry is not None:
+            if entry.version != version:
+                self.refresh_in_background()
+            return entry
+
+        # Cold cache: one caller encodes and stores the entry. The others encode
+        # for themselves rather than wait: under DATABASE_ASYNC they share the
+        # event loop thread with the holder, which is waiting on its own queries
+        if not self._lock.acquire(blocking=False):
+            return self._encode(db, version)
+        try:
+            entry = self._entry
+            if entry is None:
+                entry = self._entry = self._encode(db, version)
+        finally:
+            self._lock.release()
+        return entry
+
+    def warm(self) -> None:
+        """Encode the current catalog with a session of its own (startup hook)"""
+        db = SessionLocal()
+        try:
+            # Built outside the lock: readers keep getting the previous entry meanwhile
+            self._entry = self._encode(db, get_catalog_version(db))
+        finally:
+            db.close()
+
+    def refresh_in_background(self) -> None:
+        """Re-encode the catalog on a worker thread unless a refresh is already running"""
+        with self._refresh_lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(target=self._refresh, name="catalog-cache-refresh", daemon=True).start()
+
+    def _refresh(self) -> None:
+        try:
+            self.warm()
+        except Exception:
+            # Keep serving the previous entry; the next request retries
+            logger.exception("Catalog cache refresh failed")
+        finally:
+            self._refreshing = False
+
+    @staticmethod
+    def _encode(db: Session, version: int) -> CatalogEntry:
+        levels = {"br": settings.CATALOG_BROTLI_QUALITY, "gzip": settings.CATALOG_GZIP_LEVEL}
+        foods = db.query(Food).order_by(Food.id).all()
+        payload = [FoodResponse.model_validate(food).model_dump() for food in foods]
+        body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        digest = hashlib.sha256(body).hexdigest()[:16]
+        bodies = {}
+        for binary, identity in ((False, body), (True, encode_catalog(payload))):
+            bodies[(binary, None)] = identity
+            for encoding in SUPPORTED_ENCODINGS:
+                bodies[(binary, encoding)] = compress(identity, encoding, level=levels[encoding])
+        return CatalogEntry(version=version, etag=f'"{version}-{digest}"', bodies=bodies)
+
+
+# Process-wide cache used by the foods router
+catalog_cache = CatalogCache()
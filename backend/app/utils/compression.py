@@ -0,0 +1,161 @@
+import gzip
+import zlib
+from typing import Callable, Optional, Tuple
+from starlette.datastructures import Headers, MutableHeaders
+from ..config import settings
+from .catalog_binary import CATALOG_BINARY_MEDIA_TYPE
+from .request_metrics import add_bytes_saved
+
+try:
+    import brotli
+except ImportError:  # Brotli is optional; without it only gzip is offered
+    brotli = None
+
+# Offered content codings, preferred first when the client accepts several equally
+SUPPORTED_ENCODINGS: Tuple[str, ...] = ("br", "gzip") if brotli is not None else ("gzip",)
+
+# Content-Type prefixes worth compressing; images and the like are already compressed
+COMPRESSIBLE_TYPES = ("text/", "application/json", "application/x-ndjson", CATALOG_BINARY_MEDIA_TYPE)
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """Best supported coding the client accepts per Accept-Encoding, or None for identity"""
+    qualities = {}
+    for part in accept_encoding.split(","):
+        coding, *params = [item.strip() for item in part.split(";")]
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding.lower()] = quality
+
+    wildcard = qualities.get("*", 0.0)
+    best, best_quality = None, 0.0
+    for encoding in SUPPORTED_ENCODINGS:
+        quality = qualities.get(encoding, wildcard)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compress(body: bytes, encoding: str, level: Optional[int] = None) -> bytes:
+    """Compress a whole body; `level` defaults to the configured one for the coding"""
+    if encoding == "br":
+        return brotli.compress(body, quality=settings.COMPRESSION_BROTLI_QUALITY if level is None else level)
+    # mtime=0 keeps the output byte-identical for identical input
+    return gzip.compress(body, compresslevel=settings.COMPRESSION_GZIP_LEVEL if level is None else level, mtime=0)
+
+
+def _stream_compressor(encoding: str) -> Tuple[Callable[[bytes], bytes], Callable[[], bytes]]:
+    """(compress chunk, finish) pair for a body sent in several messages"""
+    if encoding == "br":
+        compressor = brotli.Compressor(quality=settings.COMPRESSION_BROTLI_QUALITY)
+        return compressor.process, compressor.finish
+    # wbits 31 writes the gzip container rather than raw zlib
+    compressor = zlib.compressobj(settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 31)
+    return compressor.compress, compressor.flush
+
+
+def is_compressible(headers: Headers) -> bool:
+    return (
+        "content-encoding" not in headers
+        and headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES)
+        and "no-transform" not in headers.get("cache-control", "")
+    )
+
+
+class CompressionMiddleware:
+    """
+    Pure ASGI middleware compressing response bodies with br or gzip.
+
+    Bodies under `minimum_size` bytes and responses that already carry a
+    Content-Encoding (pre-compressed cache hits) are passed through
+    untouched. Streamed bodies are compressed chunk by chunk. Bytes saved
+    are credited to the route in the request metrics.
+    """
+
+    def __init__(self, app, minimum_size: Optional[int] = None):
+        self.app = app
+        self.minimum_size = settings.COMPRESSION_MIN_SIZE if minimum_size is None else minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start = None
+        compress_chunk = finish = None
+        identity_size = compressed_size = 0
+
+        async def send_wrapper(message):
+            nonlocal start, compress_chunk, finish, identity_size, compressed_size
+            if message["type"] == "http.response.start":
+                # Held back until the first body message shows whether to compress
+                start = message
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if start is not None:
+                response_start, start = start, None
+                headers = MutableHeaders(raw=response_start["headers"])
+                eligible = (
+                    response_start["status"] not in (204, 304)
+                    and is_compressible(headers)
+                    and (more_body or len(body) >= self.minimum_size)
+                )
+                if not eligible:
+                    await send(response_start)
+                    await send(message)
+                    return
+
+                if not more_body:
+                    compressed = compress(body, encoding)
+                    if len(compressed) >= len(body):
+                        await send(response_start)
+                        await send(message)
+                        return
+                    headers["Content-Encoding"] = encoding
+                    headers["Content-Length"] = str(len(compressed))
+                    headers.add_vary_header("Accept-Encoding")
+                    add_bytes_saved(scope, len(body) - len(compressed))
+                    await send(response_start)
+                    await send({"type": "http.response.body", "body": compressed})
+                    return
+
+                # Streamed: the final length is unknown
+                del headers["Content-Length"]
+                headers["Content-Encoding"] = encoding
+                headers.add_vary_header("Accept-Encoding")
+                compress_chunk, finish = _stream_compressor(encoding)
+                await send(response_start)
+
+            if compress_chunk is None:
+                await send(message)
+                return
+
+            identity_size += len(body)
+            chunk = compress_chunk(body)
+            if not more_body:
+                chunk += finish()
+                compressed_size += len(chunk)
+                add_bytes_saved(scope, identity_size - compressed_size)
+                await send({"type": "http.response.body", "body": chunk})
+                return
+            compressed_size += len(chunk)
+            if chunk:
+                await send({"type": "http.response.body", "body": chunk, "more_body": True})
+
+        await self.app(scope, receive, send_wrapper)
@@ -1,23 +1,37 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
-from ..database import get_db
+from typing import Optional
+from ..database import DbSession, get_db
 from ..models.user import User
 from .auth import verify_token
+from .user_cache import CachedUser, user_cache
 
 # Security scheme for JWT
 security = HTTPBearer()
 
 
-def get_current_user(
+def _load_user(db: Session, user_id: int) -> Optional[CachedUser]:
+    user = db.query(User).filter(User.id == user_id).first()
+    return CachedUser.from_user(user) if user is not None else None
+
+
+async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
+    db: DbSession = Depends(get_db)
+) -> CachedUser:
     """
-    Dependency to get the current authenticated user from JWT token
+    Dependency to get the current authenticated user from JWT token.
+
+    Returns a detached `CachedUser` snapshot; repeat requests with the same
+    token are served from `user_cache` without decoding or querying.
     """
     token = credentials.credentials
     
+    cached = user_cache.get(token)
+    if cached is not None:
+        return cached
+    
     # Verify and decode token
     try:
         payload = verify_token(token)
@@ -49,7 +63,7 @@ def get_current_user(
         )
     
     # Get user from database
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.run_sync(_load_user, user_id)
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -57,4 +71,5 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    user_cache.put(token, user, token_exp=payload.get("exp"))
     return user
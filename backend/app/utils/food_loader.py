@@ -0,0 +1,110 @@
+import csv
+import os
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from ..models.food import Food
+from .catalog_cache import bump_catalog_version
+from .rollups import refresh_rollups_for_foods
+from .schema import require_unique
+
+# Canonical catalog shipped with the app
+DEFAULT_FOODS_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "indian_foods.csv")
+
+FLOAT_FIELDS = ("calories_per_unit", "protein_g", "carbs_g", "fats_g")
+TEXT_FIELDS = ("name", "unit_type", "unit_size_description")
+
+# Rows per transaction
+DEFAULT_BATCH_SIZE = 1000
+
+# Dialects loaded with INSERT ... ON CONFLICT (name), which needs foods.name to be unique
+UPSERT_DIALECTS = ("postgresql", "sqlite")
+
+
+def iter_food_rows(path: str = DEFAULT_FOODS_FILE) -> Iterator[dict]:
+    """Stream food dicts from a CSV file without reading it all into memory"""
+    with open(path, newline="", encoding="utf-8") as f:
+        for line_no, row in enumerate(csv.DictReader(f), start=2):
+            try:
+                food = {field: row[field].strip() for field in TEXT_FIELDS}
+                food.update({field: float(row[field] or 0) for field in FLOAT_FIELDS})
+            except (KeyError, ValueError, AttributeError) as e:
+                raise ValueError(f"{path}:{line_no}: invalid food row ({e})") from e
+            yield food
+
+
+def _batches(rows: Iterable[dict], size: int) -> Iterator[List[dict]]:
+    iterator = iter(rows)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def _upsert(db: Session, batch: List[dict], update_existing: bool) -> int:
+    """Insert one batch keyed on the unique food name; returns rows written"""
+    dialect = db.get_bind().dialect.name
+    if dialect in UPSERT_DIALECTS:
+        insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        # One cached statement executed with the whole batch; SQLAlchemy's
+        # insertmanyvalues packs it into multi-row INSERTs on the wire
+        stmt = insert(Food.__table__)
+        if update_existing:
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[Food.name],
+                set_={field: stmt.excluded[field] for field in (*FLOAT_FIELDS, "unit_type", "unit_size_description")},
+            )
+        else:
+            stmt = stmt.on_conflict_do_nothing(index_elements=[Food.name])
+        return len(db.execute(stmt.returning(Food.__table__.c.id), batch).all())
+
+    # Other dialects: one IN query per batch to skip names that already exist
+    existing = {
+        name for (name,) in db.query(Food.name).filter(Food.name.in_([row["name"] for row in batch]))
+    }
+    new_rows = [row for row in batch if row["name"] not in existing]
+    if new_rows:
+        db.execute(Food.__table__.insert(), new_rows)
+    return len(new_rows)
+
+
+def load_foods(
+    db: Session,
+    rows: Iterable[dict],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    update_existing: bool = False
+) -> Dict[str, int]:
+    """
+    Bulk, idempotent catalog load.
+
+    Rows are consumed in fixed-size batches, so memory stays flat however
+    large the source is. Foods are matched on their unique name: existing
+    ones are skipped, or refreshed when `update_existing` is set. Each batch
+    is committed on its own and the catalog version is bumped once per
+    batch that changed anything.
+
+    Refreshing existing foods also recomputes the daily rollups of every
+    day that logged one of them, in the same transaction as the batch, so
+    stored totals never disagree with the new nutrition values.
+    """
+    if db.get_bind().dialect.name in UPSERT_DIALECTS:
+        # Fail up front with a fix, not on the first batch with a driver error
+        require_unique(db.connection(), Food.__table__, ["name"])
+
+    read = written = rollup_days = 0
+    for batch in _batches(rows, batch_size):
+        # Duplicate names inside one statement would trip ON CONFLICT DO UPDATE
+        batch = list({row["name"]: row for row in batch}.values())
+        read += len(batch)
+        count = _upsert(db, batch, update_existing)
+        if count:
+            bump_catalog_version(db)
+            if update_existing:
+                names = [row["name"] for row in batch]
+                food_ids = [food_id for (food_id,) in db.query(Food.id).filter(Food.name.in_(names))]
+                rollup_days += refresh_rollups_for_foods(db, food_ids)
+        db.commit()
+        written += count
+    return {"read": read, "written": written, "rollup_days": rollup_days}
@@ -0,0 +1,187 @@
+import re
+import threading
+import time
+import unicodedata
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from sqlalchemy.orm import Session
+from ..config import settings
+from ..models.food import Food
+from .catalog_cache import get_catalog_version
+
+# Columns copied into the index so search results never touch the database
+FOOD_FIELDS = (
+    "id",
+    "name",
+    "calories_per_unit",
+    "protein_g",
+    "carbs_g",
+    "fats_g",
+    "unit_type",
+    "unit_size_description",
+)
+
+NGRAM_SIZE = 3
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+def normalize_name(value: str) -> str:
+    """Lowercase, strip accents and collapse punctuation to single spaces"""
+    value = unicodedata.normalize("NFKD", value)
+    value = "".join(ch for ch in value if not unicodedata.combining(ch))
+    return _NON_ALNUM.sub(" ", value.lower()).strip()
+
+
+def ngrams(value: str, size: int = NGRAM_SIZE) -> set:
+    """Return the set of character n-grams of a normalized string"""
+    return {value[i:i + size] for i in range(len(value) - size + 1)}
+
+
+class _Snapshot(NamedTuple):
+    rows: Dict[int, dict]
+    names: Dict[int, str]
+    grams: Dict[str, Tuple[int, ...]]
+
+
+class FoodSearchIndex:
+    """
+    In-memory inverted index over the foods table.
+
+    Names are normalized once and indexed by character trigram, so a search
+    only has to intersect a few posting lists instead of scanning every row.
+    Candidates are then verified with a substring check, which keeps the
+    results identical to the old `ILIKE '%term%'` filter (modulo
+    normalization), and ranked: exact name, name prefix, word prefix, then
+    any substring match.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._stale = True
+        self._version: Optional[int] = None
+        # time.monotonic() of the last catalog version check
+        self._checked_at = float("-inf")
+        self._snapshot = _Snapshot({}, {}, {})
+
+    @property
+    def is_stale(self) -> bool:
+        return self._stale
+
+    @property
+    def needs_check(self) -> bool:
+        """True if the index was invalidated or its last catalog version check has expired"""
+        return self._stale or time.monotonic() - self._checked_at >= settings.FOOD_INDEX_VERSION_TTL_SECONDS
+
+    def __len__(self) -> int:
+        return len(self._snapshot.rows)
+
+    def invalidate(self) -> None:
+        """Mark the index as out of date; it is rebuilt on the next search"""
+        self._stale = True
+
+    def rebuild(self, db: Session) -> None:
+        """Load every food and rebuild the index from scratch"""
+        version = get_catalog_version(db)
+        rows = db.query(*[getattr(Food, field) for field in FOOD_FIELDS]).all()
+        self.build(dict(zip(FOOD_FIELDS, row)) for row in rows)
+        self._version = version
+        self._checked_at = time.monotonic()
+
+    def build(self, foods) -> None:
+        """Build the index from an iterable of food dicts"""
+        row_map: Dict[int, dict] = {}
+        names: Dict[int, str] = {}
+        postings: Dict[str, List[int]] = {}
+
+        for food in foods:
+            food_id = food["id"]
+            normalized = normalize_name(food["name"])
+            row_map[food_id] = food
+            names[food_id] = normalized
+            for gram in ngrams(normalized):
+                postings.setdefault(gram, []).append(food_id)
+
+        grams = {gram: tuple(ids) for gram, ids in postings.items()}
+
+        # Readers grab the snapshot once, so swapping it is atomic for them
+        with self._lock:
+            self._snapshot = _Snapshot(row_map, names, grams)
+            self._stale = False
+
+    def ensure_fresh(self, db: Session) -> None:
+        """
+        Rebuild the index if it was invalidated or the catalog version moved.
+
+        The version is read at most once per FOOD_INDEX_VERSION_TTL_SECONDS,
+        and only one caller checks or rebuilds at a time. The others keep
+        searching the current snapshot rather than wait: under DATABASE_ASYNC
+        they all share the event loop thread, so blocking on the lock would
+        stall the very query the holder is waiting for.
+        """
+        if not self.needs_check or not self._refresh_lock.acquire(blocking=False):
+            return
+        try:
+            if self._stale or self._version != get_catalog_version(db):
+                self.rebuild(db)
+            else:
+                self._checked_at = time.monotonic()
+        finally:
+            self._refresh_lock.release()
+
+    def search(self, term: str, limit: Optional[int] = None) -> List[dict]:
+        """Return foods whose normalized name contains the term, best first"""
+        query = normalize_name(term)
+        if not query:
+            return []
+
+        snapshot = self._snapshot
+        candidates = self._candidates(snapshot, query)
+
+        matches = []
+        for food_id in candidates:
+            name = snapshot.names[food_id]
+            position = name.find(query)
+            if position < 0:
+                continue
+            matches.append((self._rank(name, query, position), len(name), name, food_id))
+
+        matches.sort()
+        if limit is not None:
+            matches = matches[:limit]
+        return [snapshot.rows[food_id] for _, _, _, food_id in matches]
+
+    @staticmethod
+    def _candidates(snapshot: "_Snapshot", query: str):
+        """Intersect trigram postings, smallest list first"""
+        if len(query) < NGRAM_SIZE:
+            return snapshot.names
+
+        postings = []
+        for gram in ngrams(query):
+            ids = snapshot.grams.get(gram)
+            if not ids:
+                return ()
+            postings.append(ids)
+
+        postings.sort(key=len)
+        result = set(postings[0])
+        for ids in postings[1:]:
+            result.intersection_update(ids)
+            if not result:
+                break
+        return result
+
+    @staticmethod
+    def _rank(name: str, query: str, position: int) -> int:
+        if name == query:
+            return 0
+        if position == 0:
+            return 1
+        if name[position - 1] == " ":
+            return 2
+        return 3
+
+
+# Process-wide index used by the foods router
+food_index = FoodSearchIndex()
@@ -0,0 +1,120 @@
+import csv
+import io
+import json
+from datetime import datetime
+from typing import AsyncIterator, Iterator, List, Optional, Sequence
+from sqlalchemy import Select, select
+from ..database import AsyncSessionLocal, SessionLocal
+from ..models.food import Food
+from ..models.meal import Meal
+
+EXPORT_FORMATS = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+EXPORT_COLUMNS = (
+    "id", "logged_at", "meal_type", "food_id", "food_name", "quantity", "unit_type",
+    "calories", "protein_g", "carbs_g", "fats_g",
+)
+
+# Rows fetched per round trip and written per chunk of the response body
+EXPORT_BATCH_SIZE = 1000
+
+
+def export_query(user_id: int, start: Optional[datetime], end: Optional[datetime]) -> Select:
+    """Plain column select of a user's meals joined with their foods, oldest first"""
+    stmt = (
+        select(
+            Meal.id, Meal.logged_at, Meal.meal_type, Meal.food_id, Food.name, Meal.quantity,
+            Food.unit_type, Food.calories_per_unit, Food.protein_g, Food.carbs_g, Food.fats_g,
+        )
+        .join(Food, Meal.food_id == Food.id)
+        .where(Meal.user_id == user_id)
+        .order_by(Meal.logged_at, Meal.id)
+        # Server-side cursor where the driver has one, fetched in fixed-size chunks
+        .execution_options(stream_results=True, yield_per=EXPORT_BATCH_SIZE)
+    )
+    if start is not None:
+        stmt = stmt.where(Meal.logged_at >= start)
+    if end is not None:
+        stmt = stmt.where(Meal.logged_at < end)
+    return stmt
+
+
+def _export_values(row: Sequence) -> list:
+    meal_id, logged_at, meal_type, food_id, food_name, quantity, unit_type, calories, protein, carbs, fats = row
+    return [
+        meal_id, logged_at.isoformat(), meal_type, food_id, food_name, quantity, unit_type,
+        round(calories * quantity, 2),
+        round((protein or 0.0) * quantity, 2),
+        round((carbs or 0.0) * quantity, 2),
+        round((fats or 0.0) * quantity, 2),
+    ]
+
+
+class _Encoder:
+    """Turns batches of result rows into response body chunks"""
+
+    def __init__(self, fmt: str):
+        self.fmt = fmt
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer, lineterminator="\n")
+
+    def header(self) -> str:
+        if self.fmt != "csv":
+            return ""
+        self._writer.writerow(EXPORT_COLUMNS)
+        return self._drain()
+
+    def encode(self, rows: List[Sequence]) -> str:
+        if self.fmt == "csv":
+            self._writer.writerows(_export_values(row) for row in rows)
+            return self._drain()
+        return "".join(
+            json.dumps(dict(zip(EXPORT_COLUMNS, _export_values(row))), separators=(",", ":")) + "\n"
+            for row in rows
+        )
+
+    def _drain(self) -> str:
+        chunk = self._buffer.getvalue()
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        return chunk
+
+
+def stream_meals(fmt: str, user_id: int, start: Optional[datetime], end: Optional[datetime]) -> Iterator[str]:
+    """
+    Sync export generator, iterated on the threadpool by StreamingResponse.
+
+    It owns its session because the request's session is closed before the
+    body is streamed. The header goes out before the query runs.
+    """
+    encoder = _Encoder(fmt)
+    yield encoder.header()
+    db = SessionLocal()
+    try:
+        result = db.execute(export_query(user_id, start, end))
+        for rows in result.partitions():
+            yield encoder.encode(rows)
+    finally:
+        db.close()
+
+
+async def stream_meals_async(
+    fmt: str, user_id: int, start: Optional[datetime], end: Optional[datetime]
+) -> AsyncIterator[str]:
+    """Async counterpart of `stream_meals` for the DATABASE_ASYNC mode"""
+    encoder = _Encoder(fmt)
+    yield encoder.header()
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(export_query(user_id, start, end))
+        async for rows in result.partitions():
+            yield encoder.encode(rows)
+
+
+def meal_export_stream(fmt: str, user_id: int, start: Optional[datetime], end: Optional[datetime]):
+    """Body iterator for the active database mode"""
+    if AsyncSessionLocal is not None:
+        return stream_meals_async(fmt, user_id, start, end)
+    return stream_meals(fmt, user_id, start, end)
@@ -0,0 +1,243 @@
+import csv
+import io
+import json
+import math
+from datetime import date, datetime, timezone
+from itertools import islice
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from ..database import SessionLocal
+from ..models.food import Food
+from ..models.meal import MEAL_TYPES, Meal
+from .rollups import add_meal_delta, apply_rollup_delta
+
+IMPORT_FORMATS = ("csv", "ndjson")
+
+# Rows per INSERT/COPY
+IMPORT_BATCH_SIZE = 10000
+
+# Row errors beyond this are counted but not listed
+MAX_REPORTED_ERRORS = 100
+
+# Column order of the rows handed to COPY / executemany
+MEAL_COLUMNS = ("user_id", "food_id", "meal_type", "quantity", "logged_at")
+
+COPY_MEALS_SQL = f"COPY meals ({', '.join(MEAL_COLUMNS)}) FROM STDIN WITH (FORMAT csv)"
+
+
+def import_format(filename: Optional[str], requested: Optional[str] = None) -> str:
+    """Explicit format if given, else guessed from the file extension (csv by default)"""
+    if requested is not None:
+        if requested not in IMPORT_FORMATS:
+            raise ValueError(f"Format must be one of: {', '.join(IMPORT_FORMATS)}")
+        return requested
+    if filename and filename.lower().endswith((".ndjson", ".jsonl")):
+        return "ndjson"
+    return "csv"
+
+
+def iter_import_records(stream: TextIO, fmt: str) -> Iterator[Tuple[int, Optional[dict]]]:
+    """
+    (line number, record) pairs; records that can't be decoded come back as None.
+
+    A CSV file too broken to keep reading raises ValueError with the line.
+    """
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        try:
+            for record in reader:
+                yield reader.line_num, record
+        except csv.Error as e:
+            raise ValueError(f"Malformed CSV at line {reader.line_num + 1}: {e}") from e
+        return
+
+    for line_no, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            record = None
+        yield line_no, record if isinstance(record, dict) else None
+
+
+def parse_logged_at(value) -> datetime:
+    """ISO 8601 date or timestamp; aware values are converted to naive UTC like logged_at"""
+    logged_at = datetime.fromisoformat(str(value).strip().replace("Z", "+00:00"))
+    if logged_at.tzinfo is not None:
+        logged_at = logged_at.astimezone(timezone.utc).replace(tzinfo=None)
+    return logged_at
+
+
+class FoodLookup:
+    """
+    Food name / id -> nutrition row, cached for the length of one import.
+
+    Each batch asks for the keys it hasn't seen yet in one IN query, so a
+    file that logs the same few hundred foods a million times costs a
+    handful of lookups. Misses are cached too.
+    """
+
+    COLUMNS = (Food.id, Food.name, Food.calories_per_unit, Food.protein_g, Food.carbs_g, Food.fats_g)
+
+    def __init__(self):
+        self._by_name = {}
+        self._by_id = {}
+
+    def prefetch(self, db: Session, names: Iterable[str], ids: Iterable[int]) -> None:
+        names = {name for name in names if name not in self._by_name}
+        ids = {food_id for food_id in ids if food_id not in self._by_id}
+        if names:
+            for food in db.execute(select(*self.COLUMNS).where(Food.name.in_(names))):
+                self._by_name[food.name] = food
+            for name in names:
+                self._by_name.setdefault(name, None)
+        if ids:
+            for food in db.execute(select(*self.COLUMNS).where(Food.id.in_(ids))):
+                self._by_id[food.id] = food
+            for food_id in ids:
+                self._by_id.setdefault(food_id, None)
+
+    def get(self, name: Optional[str], food_id: Optional[int]):
+        if name:
+            return self._by_name.get(name)
+        return self._by_id.get(food_id)
+
+
+def _food_key(record: dict) -> Tuple[Optional[str], Optional[int]]:
+    """Food name (preferred, portable between databases) or food id of a record"""
+    name = record.get("food_name") or record.get("food")
+    if name:
+        return str(name).strip(), None
+    food_id = record.get("food_id")
+    try:
+        return None, int(food_id) if food_id not in (None, "") else None
+    except (TypeError, ValueError):
+        return None, None
+
+
+def _parse_record(record: Optional[dict], foods: FoodLookup) -> tuple:
+    """(food, meal_type, quantity, logged_at) for one record, or ValueError"""
+    if record is None:
+        raise ValueError("Not a valid record")
+
+    name, food_id = _food_key(record)
+    if name is None and food_id is None:
+        raise ValueError("Missing food_name or food_id")
+    food = foods.get(name, food_id)
+    if food is None:
+        raise ValueError(f"Unknown food: {name if name is not None else food_id}")
+
+    meal_type = str(record.get("meal_type") or "").strip().lower()
+    if meal_type not in MEAL_TYPES:
+        raise ValueError(f"Meal type must be one of: {', '.join(MEAL_TYPES)}")
+
+    try:
+        quantity = float(record.get("quantity"))
+    except (TypeError, ValueError):
+        raise ValueError("Quantity must be a number")
+    if not math.isfinite(quantity) or quantity <= 0:
+        raise ValueError("Quantity must be greater than zero")
+
+    if not record.get("logged_at"):
+        raise ValueError("Missing logged_at")
+    try:
+        logged_at = parse_logged_at(record["logged_at"])
+    except ValueError:
+        raise ValueError(f"Invalid logged_at: {record['logged_at']}")
+
+    return food, meal_type, quantity, logged_at
+
+
+def _write_meals(db: Session, rows: List[tuple]) -> None:
+    """COPY on psycopg2, a single executemany everywhere else"""
+    bind = db.get_bind()
+    if bind.dialect.name == "postgresql" and bind.dialect.driver == "psycopg2":
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        buffer.seek(0)
+        cursor = db.connection().connection.cursor()
+        try:
+            cursor.copy_expert(COPY_MEALS_SQL, buffer)
+        finally:
+            cursor.close()
+        return
+
+    db.execute(Meal.__table__.insert(), [dict(zip(MEAL_COLUMNS, row)) for row in rows])
+
+
+def import_meals(
+    db: Session,
+    user_id: int,
+    records: Iterable[Tuple[int, Optional[dict]]],
+    batch_size: int = IMPORT_BATCH_SIZE
+) -> Dict[str, object]:
+    """
+    Validate and bulk insert meal records for one user.
+
+    Invalid rows are skipped and reported by line number; the rest are
+    written in batches together with their rollup deltas. The whole import
+    is one transaction: if the file turns out to be unreadable part way
+    through, nothing is kept, so the client can fix it and retry without
+    importing the first batches twice.
+    """
+    foods = FoodLookup()
+    imported = failed = 0
+    errors = []
+    records = iter(records)
+
+    while True:
+        batch = list(islice(records, batch_size))
+        if not batch:
+            break
+
+        keys = [_food_key(record) for _, record in batch if record is not None]
+        foods.prefetch(db, (name for name, _ in keys if name), (food_id for name, food_id in keys if not name and food_id))
+
+        rows = []
+        pending_rollups: Dict[Tuple[date, str], Dict[str, float]] = {}
+        for line_no, record in batch:
+            try:
+                food, meal_type, quantity, logged_at = _parse_record(record, foods)
+            except ValueError as e:
+                failed += 1
+                if len(errors) < MAX_REPORTED_ERRORS:
+                    errors.append({"line": line_no, "error": str(e)})
+                continue
+            rows.append((user_id, food.id, meal_type, quantity, logged_at))
+            add_meal_delta(pending_rollups, logged_at.date(), meal_type, food, quantity)
+
+        if rows:
+            _write_meals(db, rows)
+            for (day, meal_type), deltas in pending_rollups.items():
+                apply_rollup_delta(db, user_id, day, meal_type, deltas)
+            imported += len(rows)
+
+    db.commit()
+    return {
+        "imported": imported,
+        "failed": failed,
+        "errors": errors,
+        "errors_truncated": failed > len(errors),
+    }
+
+
+def import_meals_file(file: BinaryIO, fmt: str, user_id: int, batch_size: int = IMPORT_BATCH_SIZE) -> dict:
+    """
+    Import an uploaded or on-disk file with its own sync session.
+
+    Always runs on a sync connection (call it from a worker thread) since
+    parsing is CPU-bound and COPY needs the psycopg2 cursor.
+    """
+    stream = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+    db = SessionLocal()
+    try:
+        return import_meals(db, user_id, iter_import_records(stream, fmt), batch_size)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+        # Leave the caller's file open
+        stream.detach()
@@ -0,0 +1,125 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Callable, NoReturn, TypeVar
+from ..config import settings
+from .metrics import LatencyHistogram
+
+T = TypeVar("T")
+
+
+class HashingUnavailable(Exception):
+    """Raised when the password pool is saturated or a job timed out"""
+
+
+class PasswordHashPool:
+    """
+    Small dedicated thread pool for bcrypt work.
+
+    bcrypt releases the GIL, so threads give real parallelism here while
+    keeping the request threadpool free for everything else. At most
+    `workers + queue_size` jobs are admitted; anything beyond that is
+    rejected straight away instead of piling up, and callers give up after
+    `timeout` seconds.
+    """
+
+    def __init__(self, workers: int, queue_size: int, timeout: float):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+        self._slots = threading.BoundedSemaphore(workers + queue_size)
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._running = 0
+        self.completed = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self.wait_latency = LatencyHistogram()
+        self.run_latency = LatencyHistogram()
+
+    def run(self, fn: Callable[..., T], *args) -> T:
+        """Run `fn(*args)` on the pool and block until the result is ready"""
+        future = self._submit(fn, *args)
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            self._timed_out(future)
+
+    async def run_async(self, fn: Callable[..., T], *args) -> T:
+        """Run `fn(*args)` on the pool without blocking the event loop"""
+        future = self._submit(fn, *args)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), self.timeout)
+        except asyncio.TimeoutError:
+            self._timed_out(future)
+
+    def _submit(self, fn: Callable[..., T], *args) -> Future:
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise HashingUnavailable("Password hashing queue is full")
+
+        submitted_at = time.perf_counter()
+        with self._lock:
+            self._pending += 1
+        try:
+            return self._executor.submit(self._timed, fn, submitted_at, *args)
+        except BaseException:
+            self._release(started=False)
+            raise
+
+    def _timed_out(self, future: Future) -> NoReturn:
+        # Drop it if it hasn't started; a running bcrypt call can't be interrupted
+        if future.cancel():
+            self._release(started=False)
+        with self._lock:
+            self.timeouts += 1
+        raise HashingUnavailable("Password hashing timed out")
+
+    def _timed(self, fn: Callable[..., T], submitted_at: float, *args) -> T:
+        started_at = time.perf_counter()
+        with self._lock:
+            self._pending -= 1
+            self._running += 1
+            self.wait_latency.observe(started_at - submitted_at)
+        try:
+            return fn(*args)
+        finally:
+            with self._lock:
+                self.run_latency.observe(time.perf_counter() - started_at)
+                self.completed += 1
+            self._release(started=True)
+
+    def _release(self, started: bool) -> None:
+        with self._lock:
+            if started:
+                self._running -= 1
+            else:
+                self._pending -= 1
+        self._slots.release()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "queue_size": self.queue_size,
+                "queue_depth": self._pending,
+                "running": self._running,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "timeouts": self.timeouts,
+                "wait_seconds": self.wait_latency.snapshot(),
+                "run_seconds": self.run_latency.snapshot(),
+            }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+password_pool = PasswordHashPool(
+    settings.PASSWORD_HASH_WORKERS,
+    settings.PASSWORD_HASH_QUEUE_SIZE,
+    settings.PASSWORD_HASH_TIMEOUT_SECONDS,
+)
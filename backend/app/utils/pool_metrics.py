@@ -0,0 +1,84 @@
+import os
+import threading
+import time
+from typing import Dict, Type
+from sqlalchemy import exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import Pool, QueuePool
+from .metrics import LatencyHistogram
+
+# Checkout waits are usually sub-millisecond; the tail is what matters
+CHECKOUT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0, float("inf"))
+
+
+class PoolMetrics:
+    """Checkout counters and wait-time histogram for one connection pool"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.errors = 0
+        self.wait = LatencyHistogram(CHECKOUT_BUCKETS)
+
+    def record(self, seconds: float, failure: str = None) -> None:
+        with self._lock:
+            if failure == "timeout":
+                self.timeouts += 1
+            elif failure == "error":
+                self.errors += 1
+            else:
+                self.checkouts += 1
+                self.wait.observe(seconds)
+
+    def snapshot(self, pool: Pool) -> dict:
+        stats = {"name": self.name, "pid": os.getpid(), "class": type(pool).__name__}
+        if isinstance(pool, QueuePool):
+            stats.update(
+                size=pool.size(),
+                checked_out=pool.checkedout(),
+                checked_in=pool.checkedin(),
+                overflow=pool.overflow(),
+            )
+        with self._lock:
+            stats.update(
+                checkouts=self.checkouts,
+                checkout_timeouts=self.timeouts,
+                checkout_errors=self.errors,
+                wait_seconds=self.wait.snapshot(),
+            )
+        return stats
+
+
+def instrumented_pool_class(base: Type[Pool], metrics: PoolMetrics) -> Type[Pool]:
+    """
+    Subclass `base` so every checkout is timed and failures are counted.
+
+    The metrics live on the class, so pools rebuilt by `engine.dispose()`
+    (which calls `recreate()` on the same class) keep reporting into them.
+    """
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            connection = base.connect(self)
+        except exc.TimeoutError:
+            metrics.record(time.perf_counter() - start, failure="timeout")
+            raise
+        except Exception:
+            metrics.record(time.perf_counter() - start, failure="error")
+            raise
+        metrics.record(time.perf_counter() - start)
+        return connection
+
+    return type(f"Instrumented{base.__name__}", (base,), {"connect": connect, "metrics": metrics})
+
+
+def pool_stats(engines: Dict[str, Engine]) -> Dict[str, dict]:
+    """Live pool state plus checkout metrics for each labelled engine"""
+    stats = {}
+    for name, engine in engines.items():
+        metrics = getattr(engine.pool, "metrics", None)
+        if metrics is not None:
+            stats[name] = metrics.snapshot(engine.pool)
+    return stats
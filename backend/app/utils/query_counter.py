@@ -0,0 +1,56 @@
+from contextlib import contextmanager
+from typing import List, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+class QueryCounter:
+    """Collects every SQL statement executed on an engine while active"""
+
+    def __init__(self):
+        self.statements: List[str] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+
+def format_statements(statements: List[str]) -> str:
+    """Numbered SQL listing for assertion messages"""
+    return "\n".join(f"  {i}. {sql}" for i, sql in enumerate(statements, 1))
+
+
+@contextmanager
+def count_queries(engine: Optional[Engine] = None):
+    """
+    Count statements executed on `engine` inside the block.
+
+    Without an engine every Engine is watched, which includes the sync side
+    of the async engine used when DATABASE_ASYNC is on.
+
+    Usage:
+        with count_queries() as counter:
+            client.get("/meals/today", headers=headers)
+        print(counter.count)
+    """
+    target = Engine if engine is None else engine
+    counter = QueryCounter()
+    event.listen(target, "before_cursor_execute", counter._record)
+    try:
+        yield counter
+    finally:
+        event.remove(target, "before_cursor_execute", counter._record)
+
+
+@contextmanager
+def assert_max_queries(limit: int, engine: Optional[Engine] = None):
+    """Fail with the offending SQL if the block runs more than `limit` statements"""
+    with count_queries(engine) as counter:
+        yield counter
+    if counter.count > limit:
+        raise AssertionError(
+            f"Expected at most {limit} queries, got {counter.count}:\n{format_statements(counter.statements)}"
+        )
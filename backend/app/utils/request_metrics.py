@@ -0,0 +1,235 @@
+import time
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from .metrics import LatencyHistogram
+
+# Request latency buckets, finer than LATENCY_BUCKETS since cached routes answer in well under 10ms
+REQUEST_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, float("inf"))
+
+# Time spent inside the database per request
+DB_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0, float("inf"))
+
+# Label for requests that matched no route, so unknown paths don't create new series
+UNMATCHED_ROUTE = "<unmatched>"
+
+# Starlette appends "; charset=utf-8"
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4"
+
+# Where CompressionMiddleware and pre-compressed responses note the bytes compression saved
+BYTES_SAVED_SCOPE_KEY = "app.bytes_saved"
+
+RouteKey = Tuple[str, str]
+
+
+class RequestDbTime:
+    """Database time and statement count of the current request"""
+
+    __slots__ = ("seconds", "queries", "statements")
+
+    def __init__(self):
+        self.seconds = 0.0
+        self.queries = 0
+        # The SQL itself is only kept when the profiler asks for it
+        self.statements: Optional[List[str]] = None
+
+
+# Set by the middleware; threadpool workers and greenlets inherit a copy of the
+# context, so statements executed on behalf of the request land on this object
+current_request_db: ContextVar[Optional[RequestDbTime]] = ContextVar("current_request_db", default=None)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    # Kept on the execution context, which is discarded with the statement even if it fails
+    context._query_start = time.perf_counter()
+
+
+def _record_query(context, statement: str) -> None:
+    elapsed = time.perf_counter() - context._query_start
+    request_db = current_request_db.get()
+    if request_db is not None:
+        request_db.seconds += elapsed
+        request_db.queries += 1
+        if request_db.statements is not None:
+            request_db.statements.append(statement)
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _stop_query_timer(conn, cursor, statement, parameters, context, executemany):
+    _record_query(context, statement)
+
+
+@event.listens_for(Engine, "handle_error")
+def _stop_failed_query_timer(exception_context):
+    """Failed statements still took database time and count against the request"""
+    context = exception_context.execution_context
+    if context is not None and hasattr(context, "_query_start"):
+        _record_query(context, exception_context.statement)
+
+
+def add_bytes_saved(scope, saved: int) -> None:
+    """Credit bytes saved by compressing a response to the request's route"""
+    scope[BYTES_SAVED_SCOPE_KEY] = scope.get(BYTES_SAVED_SCOPE_KEY, 0) + saved
+
+
+class RouteMetrics:
+    """Counters and histograms for one (method, route template)"""
+
+    __slots__ = ("statuses", "latency", "db_time", "db_queries", "bytes_sent", "bytes_saved")
+
+    def __init__(self):
+        self.statuses: Dict[int, int] = {}
+        self.latency = LatencyHistogram(REQUEST_BUCKETS)
+        self.db_time = LatencyHistogram(DB_BUCKETS)
+        self.db_queries = 0
+        self.bytes_sent = 0
+        self.bytes_saved = 0
+
+
+class RequestMetrics:
+    """
+    Per-route request metrics for this worker process.
+
+    Only touched from the event loop thread (the middleware and the async
+    /metrics endpoint), so no locking is needed. Each worker keeps its own
+    numbers; scrape every worker or run one per container.
+    """
+
+    def __init__(self):
+        self.routes: Dict[RouteKey, RouteMetrics] = {}
+        self.in_flight = 0
+
+    def record(
+        self, method: str, route: str, status: int, seconds: float, db: RequestDbTime,
+        bytes_sent: int = 0, bytes_saved: int = 0
+    ) -> None:
+        metrics = self.routes.get((method, route))
+        if metrics is None:
+            metrics = self.routes[(method, route)] = RouteMetrics()
+        metrics.statuses[status] = metrics.statuses.get(status, 0) + 1
+        metrics.latency.observe(seconds)
+        metrics.db_time.observe(db.seconds)
+        metrics.db_queries += db.queries
+        metrics.bytes_sent += bytes_sent
+        metrics.bytes_saved += bytes_saved
+
+    def render(self) -> str:
+        """Prometheus text exposition format"""
+        lines: List[str] = []
+        routes = sorted(self.routes.items())
+
+        lines += [
+            "# HELP http_requests_total Requests handled, by route template and status code.",
+            "# TYPE http_requests_total counter",
+        ]
+        for (method, route), metrics in routes:
+            for status, count in sorted(metrics.statuses.items()):
+                lines.append(f"http_requests_total{_labels(method, route, status=status)} {count}")
+
+        lines += [
+            "# HELP http_requests_in_progress Requests currently being handled.",
+            "# TYPE http_requests_in_progress gauge",
+            f"http_requests_in_progress {self.in_flight}",
+        ]
+
+        _render_histogram(
+            lines, "http_request_duration_seconds", "Request latency, by route template.",
+            [(key, metrics.latency) for key, metrics in routes],
+        )
+        _render_histogram(
+            lines, "http_request_db_seconds", "Time spent executing SQL per request, by route template.",
+            [(key, metrics.db_time) for key, metrics in routes],
+        )
+
+        lines += [
+            "# HELP http_request_db_queries_total SQL statements executed, by route template.",
+            "# TYPE http_request_db_queries_total counter",
+        ]
+        for (method, route), metrics in routes:
+            lines.append(f"http_request_db_queries_total{_labels(method, route)} {metrics.db_queries}")
+
+        lines += [
+            "# HELP http_response_bytes_total Response body bytes sent, after compression, by route template.",
+            "# TYPE http_response_bytes_total counter",
+        ]
+        for (method, route), metrics in routes:
+            lines.append(f"http_response_bytes_total{_labels(method, route)} {metrics.bytes_sent}")
+
+        lines += [
+            "# HELP http_response_bytes_saved_total Response body bytes saved by compression, by route template.",
+            "# TYPE http_response_bytes_saved_total counter",
+        ]
+        for (method, route), metrics in routes:
+            lines.append(f"http_response_bytes_saved_total{_labels(method, route)} {metrics.bytes_saved}")
+
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(method: str, route: str, **extra) -> str:
+    pairs = [("method", method), ("route", route), *extra.items()]
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in pairs) + "}"
+
+
+def _render_histogram(lines: List[str], name: str, help_text: str, series) -> None:
+    lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+    for (method, route), histogram in series:
+        snapshot = histogram.snapshot()
+        for bound, count in snapshot["buckets"].items():
+            lines.append(f"{name}_bucket{_labels(method, route, le=bound)} {count}")
+        lines.append(f"{name}_sum{_labels(method, route)} {snapshot['sum']}")
+        lines.append(f"{name}_count{_labels(method, route)} {snapshot['count']}")
+
+
+request_metrics = RequestMetrics()
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware recording per-route metrics.
+
+    The route template comes from the matched route FastAPI leaves in the
+    scope, so `/meals/42` is counted as `/meals/{meal_id}`.
+    """
+
+    def __init__(self, app, metrics: RequestMetrics = request_metrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        bytes_sent = 0
+        db = RequestDbTime()
+        token = current_request_db.set(db)
+
+        async def send_wrapper(message):
+            nonlocal status, bytes_sent
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                bytes_sent += len(message.get("body", b""))
+            await send(message)
+
+        metrics = self.metrics
+        metrics.in_flight += 1
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            metrics.in_flight -= 1
+            current_request_db.reset(token)
+            route = scope.get("route")
+            metrics.record(
+                scope["method"], route.path if route is not None else UNMATCHED_ROUTE, status, elapsed, db,
+                bytes_sent, scope.get(BYTES_SAVED_SCOPE_KEY, 0)
+            )
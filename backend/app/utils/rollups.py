@@ -0,0 +1,320 @@
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+from sqlalchemy import delete, func, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from ..models.food import Food
+from ..models.meal import Meal
+from ..models.rollup import DailyNutritionTotal
+
+MACRO_COLUMNS = ("calories", "protein_g", "carbs_g", "fats_g")
+
+# Totals that differ by less than this are treated as float rounding noise
+DRIFT_TOLERANCE = 0.01
+
+RollupKey = Tuple[int, date, str]
+
+GRANULARITIES = ("day", "week", "month")
+
+
+def meal_deltas(food: Food, quantity: float) -> Dict[str, float]:
+    """Nutrition contributed by `quantity` servings of `food`"""
+    return {
+        "calories": food.calories_per_unit * quantity,
+        "protein_g": (food.protein_g or 0.0) * quantity,
+        "carbs_g": (food.carbs_g or 0.0) * quantity,
+        "fats_g": (food.fats_g or 0.0) * quantity,
+    }
+
+
+def _upsert_insert(db: Session):
+    """Return the dialect's INSERT construct if it supports ON CONFLICT"""
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert(DailyNutritionTotal)
+    if dialect == "sqlite":
+        return sqlite.insert(DailyNutritionTotal)
+    return None
+
+
+def apply_meal_to_rollup(
+    db: Session,
+    user_id: int,
+    day: date,
+    meal_type: str,
+    food: Food,
+    quantity: float,
+    sign: int = 1
+) -> None:
+    """
+    Add (sign=1) or remove (sign=-1) one meal from the daily rollup.
+
+    Runs inside the caller's transaction so the rollup commits or rolls back
+    together with the meal row itself.
+    """
+    deltas = {column: sign * value for column, value in meal_deltas(food, quantity).items()}
+    deltas["meal_count"] = sign
+    apply_rollup_delta(db, user_id, day, meal_type, deltas)
+
+
+def apply_rollup_delta(db: Session, user_id: int, day: date, meal_type: str, deltas: Dict[str, float]) -> None:
+    """
+    Add pre-aggregated deltas (macros plus meal_count) to one rollup row.
+
+    Batch writers sum their meals per (day, meal_type) first and call this
+    once per key instead of once per meal.
+    """
+    key = {"user_id": user_id, "day": day, "meal_type": meal_type}
+    table = DailyNutritionTotal.__table__
+    adding = deltas["meal_count"] > 0
+
+    insert = _upsert_insert(db) if adding else None
+    if insert is not None:
+        stmt = insert.values(**key, **deltas)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.user_id, table.c.day, table.c.meal_type],
+            set_={column: table.c[column] + stmt.excluded[column] for column in deltas},
+        )
+        db.execute(stmt)
+        return
+
+    # Increment in SQL so concurrent writers don't overwrite each other
+    matches_key = (
+        (DailyNutritionTotal.user_id == user_id)
+        & (DailyNutritionTotal.day == day)
+        & (DailyNutritionTotal.meal_type == meal_type)
+    )
+    result = db.execute(
+        update(DailyNutritionTotal)
+        .where(matches_key)
+        .values({column: table.c[column] + value for column, value in deltas.items()})
+    )
+    if result.rowcount == 0 and adding:
+        db.execute(table.insert().values(**key, **deltas))
+
+    if not adding:
+        db.execute(delete(DailyNutritionTotal).where(matches_key, DailyNutritionTotal.meal_count <= 0))
+
+
+def add_meal_delta(
+    pending: Dict[Tuple[date, str], Dict[str, float]],
+    day: date,
+    meal_type: str,
+    food: Food,
+    quantity: float,
+    sign: int = 1
+) -> None:
+    """Accumulate one meal into per-(day, meal_type) deltas for apply_rollup_delta"""
+    deltas = pending.setdefault((day, meal_type), dict.fromkeys((*MACRO_COLUMNS, "meal_count"), 0))
+    for column, value in meal_deltas(food, quantity).items():
+        deltas[column] += sign * value
+    deltas["meal_count"] += sign
+
+
+def get_day_totals(db: Session, user_id: int, day: date) -> Dict[str, float]:
+    """Sum the rollup rows for one user and day across meal types"""
+    row = db.query(
+        *[func.coalesce(func.sum(getattr(DailyNutritionTotal, column)), 0.0) for column in MACRO_COLUMNS]
+    ).filter(
+        DailyNutritionTotal.user_id == user_id,
+        DailyNutritionTotal.day == day
+    ).one()
+    return dict(zip(MACRO_COLUMNS, row))
+
+
+def compute_rollups_from_meals(
+    db: Session, user_id: Optional[int] = None, days: Optional[Sequence] = None
+) -> Dict[RollupKey, dict]:
+    """
+    Aggregate the meals table into rollup rows in a single GROUP BY query.
+
+    `days` limits it to those days, given as the dialect returns func.date()
+    (strings on SQLite, dates elsewhere).
+    """
+    day = func.date(Meal.logged_at)
+    query = db.query(
+        Meal.user_id,
+        day,
+        Meal.meal_type,
+        func.sum(Food.calories_per_unit * Meal.quantity),
+        func.sum(func.coalesce(Food.protein_g, 0.0) * Meal.quantity),
+        func.sum(func.coalesce(Food.carbs_g, 0.0) * Meal.quantity),
+        func.sum(func.coalesce(Food.fats_g, 0.0) * Meal.quantity),
+        func.count(Meal.id),
+    ).join(Food, Meal.food_id == Food.id)
+    if user_id is not None:
+        query = query.filter(Meal.user_id == user_id)
+    if days is not None:
+        query = query.filter(day.in_(days))
+    query = query.group_by(Meal.user_id, day, Meal.meal_type)
+
+    rollups = {}
+    for row_user_id, row_day, meal_type, *totals, count in query:
+        # SQLite returns func.date() as a string
+        if isinstance(row_day, str):
+            row_day = date.fromisoformat(row_day)
+        rollups[(row_user_id, row_day, meal_type)] = dict(zip(MACRO_COLUMNS, totals), meal_count=count)
+    return rollups
+
+
+def find_rollup_drift(db: Session, user_id: Optional[int] = None) -> List[dict]:
+    """Compare stored rollups with a fresh aggregate and list every mismatch"""
+    expected = compute_rollups_from_meals(db, user_id)
+    query = db.query(DailyNutritionTotal)
+    if user_id is not None:
+        query = query.filter(DailyNutritionTotal.user_id == user_id)
+    stored = {(row.user_id, row.day, row.meal_type): row for row in query}
+
+    drift = []
+    for key in sorted(set(expected) | set(stored)):
+        want = expected.get(key)
+        have = stored.get(key)
+        have_values = (
+            {column: getattr(have, column) for column in (*MACRO_COLUMNS, "meal_count")}
+            if have is not None else None
+        )
+        if want is None or have_values is None:
+            drift.append({"key": key, "expected": want, "stored": have_values})
+            continue
+        if want["meal_count"] != have_values["meal_count"] or any(
+            abs(want[column] - have_values[column]) > DRIFT_TOLERANCE for column in MACRO_COLUMNS
+        ):
+            drift.append({"key": key, "expected": want, "stored": have_values})
+    return drift
+
+
+def rebuild_rollups(db: Session, user_id: Optional[int] = None) -> int:
+    """Replace stored rollups with a fresh aggregate of the meals table"""
+    rollups = compute_rollups_from_meals(db, user_id)
+
+    stmt = delete(DailyNutritionTotal)
+    if user_id is not None:
+        stmt = stmt.where(DailyNutritionTotal.user_id == user_id)
+    db.execute(stmt)
+
+    _insert_rollups(db, rollups)
+    db.commit()
+    return len(rollups)
+
+
+def _insert_rollups(db: Session, rollups: Dict[RollupKey, dict]) -> None:
+    if rollups:
+        db.execute(
+            DailyNutritionTotal.__table__.insert(),
+            [
+                {"user_id": key[0], "day": key[1], "meal_type": key[2], **values}
+                for key, values in rollups.items()
+            ],
+        )
+
+
+def refresh_rollups_for_foods(db: Session, food_ids: Sequence[int]) -> int:
+    """
+    Recompute the rollup rows of every (user, day) with a meal of one of `food_ids`.
+
+    For when food nutrition values change in place: the incremental deltas
+    were taken at the old values. Runs inside the caller's transaction and
+    returns the number of (user, day) pairs refreshed.
+    """
+    if not food_ids:
+        return 0
+    affected: Dict[int, set] = {}
+    day = func.date(Meal.logged_at)
+    for user_id, row_day in db.query(Meal.user_id, day).filter(Meal.food_id.in_(food_ids)).distinct():
+        affected.setdefault(user_id, set()).add(row_day)
+
+    for user_id, days in affected.items():
+        days = sorted(days)
+        rollups = compute_rollups_from_meals(db, user_id, days)
+        db.execute(delete(DailyNutritionTotal).where(
+            DailyNutritionTotal.user_id == user_id,
+            DailyNutritionTotal.day.in_([date.fromisoformat(d) if isinstance(d, str) else d for d in days]),
+        ))
+        _insert_rollups(db, rollups)
+    return sum(len(days) for days in affected.values())
+
+
+def bucket_start(day: date, granularity: str) -> date:
+    """First day of the bucket containing `day` (weeks start on Monday)"""
+    if granularity == "week":
+        return day - timedelta(days=day.weekday())
+    if granularity == "month":
+        return day.replace(day=1)
+    return day
+
+
+def next_bucket(start: date, granularity: str) -> date:
+    if granularity == "week":
+        return start + timedelta(days=7)
+    if granularity == "month":
+        return (start.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return start + timedelta(days=1)
+
+
+def count_buckets(start: date, end: date, granularity: str) -> int:
+    if granularity == "week":
+        return (bucket_start(end, "week") - bucket_start(start, "week")).days // 7 + 1
+    if granularity == "month":
+        return (end.year - start.year) * 12 + end.month - start.month + 1
+    return (end - start).days + 1
+
+
+def _bucket_expression(dialect: str, granularity: str):
+    """SQL expression truncating the rollup day to its bucket, if the dialect has one"""
+    day = DailyNutritionTotal.day
+    if granularity == "day":
+        return day
+    if dialect == "postgresql":
+        return func.date(func.date_trunc(granularity, day))
+    if dialect == "sqlite":
+        if granularity == "week":
+            # Go back six days, then forward to the next Monday (or stay on it)
+            return func.date(day, "-6 days", "weekday 1")
+        return func.date(day, "start of month")
+    return None
+
+
+def get_range_totals(
+    db: Session,
+    user_id: int,
+    start: date,
+    end: date,
+    granularity: str
+) -> List[dict]:
+    """
+    Per-bucket totals for an inclusive date range in one GROUP BY query.
+
+    Aggregates the daily rollup table rather than raw meals, so a year of
+    history is at most 365 * 4 input rows. Empty buckets are filled with
+    zeros so charts get a continuous series.
+    """
+    bucket = _bucket_expression(db.get_bind().dialect.name, granularity)
+    # Dialects without a truncation function are grouped by day and folded here
+    group_by = bucket if bucket is not None else DailyNutritionTotal.day
+
+    rows = db.query(
+        group_by,
+        *[func.sum(getattr(DailyNutritionTotal, column)) for column in MACRO_COLUMNS],
+        func.sum(DailyNutritionTotal.meal_count),
+    ).filter(
+        DailyNutritionTotal.user_id == user_id,
+        DailyNutritionTotal.day >= start,
+        DailyNutritionTotal.day <= end
+    ).group_by(group_by).all()
+
+    buckets: Dict[date, dict] = {}
+    current = bucket_start(start, granularity)
+    while current <= end:
+        buckets[current] = dict.fromkeys(MACRO_COLUMNS, 0.0)
+        buckets[current]["meal_count"] = 0
+        current = next_bucket(current, granularity)
+
+    for row_bucket, *totals, count in rows:
+        if isinstance(row_bucket, str):
+            row_bucket = date.fromisoformat(row_bucket)
+        entry = buckets[bucket_start(row_bucket, granularity)]
+        for column, value in zip(MACRO_COLUMNS, totals):
+            entry[column] += value or 0.0
+        entry["meal_count"] += count or 0
+
+    return [{"start": key, **values} for key, values in buckets.items()]
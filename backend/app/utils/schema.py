@@ -0,0 +1,86 @@
+from typing import List, Sequence
+from sqlalchemy import Index, Table, func, inspect, select
+from sqlalchemy.engine import Connection, Engine
+from ..database import Base
+from .. import models  # noqa: F401 - registers every table on Base.metadata
+
+
+class SchemaOutOfDate(RuntimeError):
+    """The database lacks a table, index or constraint the code relies on"""
+
+
+def _non_unique_indexes(inspector, table: Table) -> List[Index]:
+    """Indexes declared unique on the model that exist in the database without the constraint"""
+    existing = {index["name"]: bool(index["unique"]) for index in inspector.get_indexes(table.name)}
+    return [index for index in table.indexes if index.unique and existing.get(index.name) is False]
+
+
+def missing_schema(engine: Engine) -> List[str]:
+    """Tables and indexes declared on the models that the database lacks (or has without UNIQUE)"""
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    missing = []
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            missing.append(table.name)
+            continue
+        existing_indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+        missing.extend(
+            f"{table.name}.{index.name}" for index in table.indexes if index.name not in existing_indexes
+        )
+        missing.extend(f"{table.name}.{index.name} (unique)" for index in _non_unique_indexes(inspector, table))
+    return missing
+
+
+def _make_unique(engine: Engine, index: Index) -> None:
+    """Recreate an existing index as UNIQUE, refusing if the column already holds duplicates"""
+    columns = list(index.columns)
+    with engine.begin() as conn:
+        duplicates = conn.execute(
+            select(*columns).group_by(*columns).having(func.count() > 1).limit(5)
+        ).all()
+        if duplicates:
+            listed = ", ".join(repr(row[0] if len(row) == 1 else tuple(row)) for row in duplicates)
+            raise SchemaOutOfDate(
+                f"Cannot make {index.table.name}.{index.name} unique, duplicate values include {listed}. "
+                "Remove the duplicates and run init_db.py again."
+            )
+        index.drop(bind=conn)
+        index.create(bind=conn)
+
+
+def init_schema(engine: Engine) -> List[str]:
+    """
+    Create missing tables and indexes, returning what was added.
+
+    Additive only: existing tables are left as they are and the only index
+    changed in place is one the models declare unique but the database has
+    as a plain index (foods.name, before the bulk loader), once it holds no
+    duplicates. Safe to run on every deploy.
+    """
+    missing = missing_schema(engine)
+    if missing:
+        Base.metadata.create_all(bind=engine)
+        # create_all skips tables that exist, so add indexes declared on them later
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(bind=engine, checkfirst=True)
+        inspector = inspect(engine)
+        for table in Base.metadata.sorted_tables:
+            for index in _non_unique_indexes(inspector, table):
+                _make_unique(engine, index)
+    return missing
+
+
+def require_unique(conn: Connection, table: Table, columns: Sequence[str]) -> None:
+    """Raise SchemaOutOfDate unless a unique index or constraint covers exactly `columns`"""
+    inspector = inspect(conn)
+    wanted = list(columns)
+    unique_sets = [
+        index["column_names"] for index in inspector.get_indexes(table.name) if index["unique"]
+    ] + [constraint["column_names"] for constraint in inspector.get_unique_constraints(table.name)]
+    if wanted not in unique_sets:
+        raise SchemaOutOfDate(
+            f"{table.name}({', '.join(wanted)}) is not unique in this database; "
+            "run python scripts/init_db.py to upgrade the schema"
+        )
@@ -0,0 +1,40 @@
+from typing import Dict, Iterable, List
+from ..models.food import Food
+from ..models.meal import Meal
+from .food_search import FOOD_FIELDS
+
+# List routes build these plain dicts from rows they loaded themselves and
+# hand them straight to ORJSONResponse. Returning a Response makes FastAPI
+# skip response_model validation, which is only worth paying for on data
+# from outside. Keys must stay in step with FoodResponse and MealResponse,
+# which still document these routes in OpenAPI.
+
+
+def food_payload(food) -> dict:
+    """FoodResponse-shaped dict from a Food or a row with the FOOD_FIELDS columns"""
+    return {field: getattr(food, field) for field in FOOD_FIELDS}
+
+
+def meal_payload(meal: Meal, food: dict) -> dict:
+    """MealResponse-shaped dict; `food` is the meal's already-built food payload"""
+    return {
+        "id": meal.id,
+        "food": food,
+        "meal_type": meal.meal_type,
+        "quantity": meal.quantity,
+        "logged_at": meal.logged_at,
+        "total_calories": food["calories_per_unit"] * meal.quantity,
+    }
+
+
+def meals_payload(meals: Iterable[Meal]) -> List[dict]:
+    """MealResponse-shaped dicts, building each distinct food's dict only once"""
+    foods: Dict[int, dict] = {}
+    payload = []
+    for meal in meals:
+        food: Food = meal.food
+        food_dict = foods.get(food.id)
+        if food_dict is None:
+            food_dict = foods[food.id] = food_payload(food)
+        payload.append(meal_payload(meal, food_dict))
+    return payload
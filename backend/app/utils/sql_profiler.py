@@ -0,0 +1,147 @@
+import logging
+import time
+from typing import Callable, List, Optional, TypeVar
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from ..config import settings
+from .query_counter import format_statements
+from .request_metrics import current_request_db
+
+logger = logging.getLogger("app.sql")
+
+F = TypeVar("F", bound=Callable)
+
+DB_QUERIES_HEADER = "X-DB-Queries"
+DB_TIME_HEADER = "X-DB-Time-Ms"
+
+
+class QueryBudgetExceeded(AssertionError):
+    """A request ran more SQL statements than its route's declared budget"""
+
+
+def query_budget(limit: int) -> Callable[[F], F]:
+    """
+    Declare the most SQL statements one call of a route may run.
+
+    Goes below the router decorator, so FastAPI registers the marked function:
+
+        @router.get("/today")
+        @query_budget(2)
+        async def get_todays_meals(...):
+    """
+    def mark(endpoint: F) -> F:
+        endpoint.query_budget = limit
+        return endpoint
+    return mark
+
+
+# Savepoint wrapping EXPLAIN on the request's own connection
+_EXPLAIN_SAVEPOINT = "sql_profiler_explain"
+
+
+def _explain(conn, statement: str, parameters) -> List[str]:
+    """
+    Plan lines for a statement, run on the raw DBAPI connection so no events fire.
+
+    This is the request's connection, inside its open transaction. Outside
+    SQLite a failing statement aborts that transaction (Postgres refuses
+    everything until rollback), so EXPLAIN runs inside a savepoint that is
+    rolled back if it fails.
+    """
+    sqlite = conn.dialect.name == "sqlite"
+    prefix = "EXPLAIN QUERY PLAN" if sqlite else "EXPLAIN"
+    cursor = conn.connection.cursor()
+    try:
+        if sqlite:
+            cursor.execute(f"{prefix} {statement}", parameters)
+            return [str(row[-1]) for row in cursor.fetchall()]
+
+        cursor.execute(f"SAVEPOINT {_EXPLAIN_SAVEPOINT}")
+        try:
+            cursor.execute(f"{prefix} {statement}", parameters)
+            lines = [str(row[-1]) for row in cursor.fetchall()]
+        except Exception:
+            cursor.execute(f"ROLLBACK TO SAVEPOINT {_EXPLAIN_SAVEPOINT}")
+            raise
+        cursor.execute(f"RELEASE SAVEPOINT {_EXPLAIN_SAVEPOINT}")
+        return lines
+    finally:
+        cursor.close()
+
+
+def _start_slow_query_timer(conn, cursor, statement, parameters, context, executemany):
+    context._profiler_start = time.perf_counter()
+
+
+def _log_slow_query(conn, cursor, statement, parameters, context, executemany):
+    elapsed_ms = (time.perf_counter() - context._profiler_start) * 1000
+    if elapsed_ms < settings.SQL_SLOW_QUERY_MS:
+        return
+    lines = ["(not available for executemany)"]
+    if not executemany:
+        try:
+            lines = _explain(conn, statement, parameters) or ["(no plan rows)"]
+        except Exception as e:
+            lines = [f"(EXPLAIN failed: {e})"]
+    plan = "\n".join(f"    {line}" for line in lines)
+    # Parameters are left out on purpose: they can hold password hashes and personal data
+    logger.warning("Slow query (%.1f ms): %s\n  plan:\n%s", elapsed_ms, statement, plan)
+
+
+def install_slow_query_log() -> None:
+    """Log statements slower than SQL_SLOW_QUERY_MS on every engine; a no-op when it's 0"""
+    if settings.SQL_SLOW_QUERY_MS <= 0 or event.contains(Engine, "after_cursor_execute", _log_slow_query):
+        return
+    event.listen(Engine, "before_cursor_execute", _start_slow_query_timer)
+    event.listen(Engine, "after_cursor_execute", _log_slow_query)
+
+
+class QueryProfileMiddleware:
+    """
+    Per-request SQL accounting on top of MetricsMiddleware's counters.
+
+    Must sit inside MetricsMiddleware, which sets up the per-request
+    counter. When the response starts it:
+      - adds X-DB-Queries / X-DB-Time-Ms headers if SQL_DEBUG_HEADERS is on
+      - checks the route's @query_budget, logging a warning, or raising
+        QueryBudgetExceeded (a 500, and a failure under TestClient) if
+        SQL_QUERY_BUDGET_STRICT is on
+    Statements issued after the response started (streamed bodies) are not
+    counted against the budget.
+    """
+
+    def __init__(self, app, debug_headers: Optional[bool] = None, strict: Optional[bool] = None):
+        self.app = app
+        self.debug_headers = settings.SQL_DEBUG_HEADERS if debug_headers is None else debug_headers
+        self.strict = settings.SQL_QUERY_BUDGET_STRICT if strict is None else strict
+
+    async def __call__(self, scope, receive, send):
+        db = current_request_db.get()
+        if scope["type"] != "http" or db is None:
+            await self.app(scope, receive, send)
+            return
+        if self.strict:
+            db.statements = []
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                self._check_budget(scope, db)
+                if self.debug_headers:
+                    message["headers"] = [
+                        *message.get("headers", []),
+                        (DB_QUERIES_HEADER.lower().encode(), str(db.queries).encode()),
+                        (DB_TIME_HEADER.lower().encode(), f"{db.seconds * 1000:.2f}".encode()),
+                    ]
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+    def _check_budget(self, scope, db) -> None:
+        route = scope.get("route")
+        budget = getattr(getattr(route, "endpoint", None), "query_budget", None)
+        if budget is None or db.queries <= budget:
+            return
+        message = f"{scope['method']} {route.path} ran {db.queries} SQL statements, budget is {budget}"
+        if self.strict:
+            raise QueryBudgetExceeded(f"{message}:\n{format_statements(db.statements)}")
+        logger.warning(message)
@@ -0,0 +1,134 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Optional, Set, Tuple
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from ..config import settings
+from ..models.user import User
+
+
+@dataclass(frozen=True)
+class CachedUser:
+    """
+    Detached snapshot of the profile fields routes read from the current user.
+
+    It exposes the same attributes as `User` (minus the password hash and
+    relationships), so routes and `UserResponse` work with either.
+    """
+    id: int
+    email: str
+    daily_calorie_goal: int
+    created_at: datetime
+
+    @classmethod
+    def from_user(cls, user: User) -> "CachedUser":
+        return cls(
+            id=user.id,
+            email=user.email,
+            daily_calorie_goal=user.daily_calorie_goal,
+            created_at=user.created_at,
+        )
+
+
+class UserCache:
+    """
+    Bounded LRU of verified token -> user snapshot with a per-entry TTL.
+
+    A hit skips both the JWT decode and the users lookup. Entries never
+    outlive the token's own `exp`, and every token of a user is dropped as
+    soon as that user row is updated or deleted in this process; other
+    workers catch up within the TTL.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[float, CachedUser]]" = OrderedDict()
+        self._tokens_by_user: Dict[int, Set[str]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, token: str) -> Optional[CachedUser]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, user = entry
+            if expires_at <= now:
+                self._remove(token)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(token)
+            self.hits += 1
+            return user
+
+    def put(self, token: str, user: CachedUser, token_exp: Optional[float] = None) -> None:
+        """Cache a user for a token; `token_exp` is the JWT exp as a unix timestamp"""
+        if self.max_size <= 0:
+            return
+        ttl = self.ttl_seconds
+        if token_exp is not None:
+            ttl = min(ttl, token_exp - time.time())
+        if ttl <= 0:
+            return
+
+        with self._lock:
+            if token in self._entries:
+                self._remove(token)
+            self._entries[token] = (time.monotonic() + ttl, user)
+            self._tokens_by_user.setdefault(user.id, set()).add(token)
+            while len(self._entries) > self.max_size:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def invalidate_user(self, user_id: int) -> None:
+        """Forget every cached token belonging to a user"""
+        with self._lock:
+            for token in list(self._tokens_by_user.get(user_id, ())):
+                self._remove(token)
+            self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._tokens_by_user.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+    def _remove(self, token: str) -> None:
+        _, user = self._entries.pop(token)
+        tokens = self._tokens_by_user.get(user.id)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._tokens_by_user[user.id]
+
+
+# Process-wide cache used by get_current_user
+user_cache = UserCache(settings.USER_CACHE_MAX_SIZE, settings.USER_CACHE_TTL_SECONDS)
+
+
+@event.listens_for(Session, "before_flush")
+def _invalidate_on_user_write(session, flush_context, instances):
+    """A changed goal, email or deleted account must not be served from cache"""
+    for obj in (*session.dirty, *session.deleted):
+        if isinstance(obj, User):
+            user_cache.invalidate_user(obj.id)
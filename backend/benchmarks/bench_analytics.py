@@ -0,0 +1,286 @@
+"""
+Benchmark: vectorized nutrition analytics vs a row-by-row Python loop
+
+Usage:
+    python benchmarks/bench_analytics.py [--meals 10000000] [--users 1000] [--days 365] [--db-meals 1000000]
+
+Part 1 generates synthetic meals straight into arrays (no database, so only
+the computation is timed) and produces, both ways, per-user daily totals for
+every macro, a 7-day rolling average of each and the 10th/50th/90th
+percentile of each user's logged days:
+
+  loop        one Python iteration per meal, summing food nutrients times
+              quantity into a dict per (user, day) like get_daily_stats
+              does for a single day, then per-user rolling sums and sorts
+  vectorized  app.utils.analytics: one gather from the nutrient matrix,
+              bincount per macro, cumsum for the rolling window and
+              nanpercentile
+
+The loop is fed plain tuples in chunks (it never touches ORM objects), so
+it is a generous baseline. Both results are checked against each other.
+
+Part 2 writes --db-meals of those meals to a throwaway SQLite database and
+times the full path to per-user daily totals, loading included: a loop over
+SQLAlchemy result rows against load_meal_arrays + the nutrient matrix +
+daily_totals. Loading dominates the vectorized side, so this is the figure
+to expect from scripts/nutrition_report.py.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from app.models.food import Food
+from app.models.meal import MEAL_TYPES, Meal
+from app.models.user import User
+from app.utils.analytics import (
+    MealArrays, NutrientMatrix, daily_percentiles, daily_totals, load_meal_arrays, rolling_mean,
+)
+from app.utils.schema import init_schema
+
+WINDOW = 7
+PERCENTILES = (10, 50, 90)
+
+
+def synthetic_meals(count: int, users: int, days: int, foods: int, start: date, seed: int) -> MealArrays:
+    rng = np.random.default_rng(seed)
+    return MealArrays(
+        user_id=rng.integers(1, users + 1, count),
+        day=np.datetime64(start, "D") + rng.integers(0, days, count),
+        meal_type=rng.integers(0, len(MEAL_TYPES), count).astype(np.int8),
+        food_id=rng.integers(1, foods + 1, count),
+        quantity=rng.choice([0.5, 1.0, 1.5, 2.0], count),
+    )
+
+
+def synthetic_matrix(foods: int, seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed + 1)
+    matrix = np.zeros((foods + 1, 4))
+    matrix[1:] = np.round(rng.uniform([20, 0, 0, 0], [500, 30, 80, 30], (foods, 4)), 1)
+    return matrix
+
+
+def loop_analytics(meals: MealArrays, matrix: np.ndarray, start: date, days: int, chunk: int):
+    """Row-by-row reference; returns (totals per (user, day), rolling, percentiles) and seconds spent"""
+    foods = {food_id: tuple(row) for food_id, row in enumerate(matrix.tolist())}
+    day0 = np.datetime64(start, "D")
+    totals = {}
+    elapsed = 0.0
+
+    for offset in range(0, len(meals.quantity), chunk):
+        # Converting to Python objects is setup, not part of the loop being timed
+        columns = [
+            meals.user_id[offset:offset + chunk].tolist(),
+            (meals.day[offset:offset + chunk] - day0).astype(np.int64).tolist(),
+            meals.food_id[offset:offset + chunk].tolist(),
+            meals.quantity[offset:offset + chunk].tolist(),
+        ]
+        begin = time.perf_counter()
+        for user_id, day, food_id, quantity in zip(*columns):
+            calories, protein, carbs, fats = foods[food_id]
+            day_totals = totals.get((user_id, day))
+            if day_totals is None:
+                day_totals = totals[(user_id, day)] = [0.0, 0.0, 0.0, 0.0]
+            day_totals[0] += calories * quantity
+            day_totals[1] += protein * quantity
+            day_totals[2] += carbs * quantity
+            day_totals[3] += fats * quantity
+        elapsed += time.perf_counter() - begin
+
+    begin = time.perf_counter()
+    zero = [0.0, 0.0, 0.0, 0.0]
+    rolling, percentiles = {}, {}
+    for user_id in sorted({user_id for user_id, _ in totals}):
+        series = [totals.get((user_id, day), zero) for day in range(days)]
+        window_sum = [0.0, 0.0, 0.0, 0.0]
+        user_rolling = []
+        for day, values in enumerate(series):
+            for i in range(4):
+                window_sum[i] += values[i]
+                if day >= WINDOW:
+                    window_sum[i] -= series[day - WINDOW][i]
+            user_rolling.append([value / min(day + 1, WINDOW) for value in window_sum])
+        rolling[user_id] = user_rolling
+
+        logged = [totals[(user_id, day)] for day in range(days) if (user_id, day) in totals]
+        user_percentiles = []
+        for pct in PERCENTILES:
+            row = []
+            for i in range(4):
+                ordered = sorted(values[i] for values in logged)
+                # Linear interpolation, as np.percentile does
+                position = (len(ordered) - 1) * pct / 100
+                low = int(position)
+                high = min(low + 1, len(ordered) - 1)
+                row.append(ordered[low] + (ordered[high] - ordered[low]) * (position - low))
+            user_percentiles.append(row)
+        percentiles[user_id] = user_percentiles
+    elapsed += time.perf_counter() - begin
+    return (totals, rolling, percentiles), elapsed
+
+
+def vectorized_analytics(meals: MealArrays, matrix: np.ndarray, start: date, end: date):
+    begin = time.perf_counter()
+    daily = daily_totals(meals, matrix, start, end)
+    timings = {"daily totals": time.perf_counter() - begin}
+
+    begin = time.perf_counter()
+    rolling = rolling_mean(daily.totals, WINDOW)
+    timings["rolling mean"] = time.perf_counter() - begin
+
+    begin = time.perf_counter()
+    percentiles = daily_percentiles(daily, PERCENTILES)
+    timings["percentiles"] = time.perf_counter() - begin
+    return (daily, rolling, percentiles), timings
+
+
+def check(loop_result, vector_result):
+    totals, rolling, percentiles = loop_result
+    daily, vector_rolling, vector_percentiles = vector_result
+    for (user_id, day), values in list(totals.items())[:10000]:
+        user = np.searchsorted(daily.user_ids, user_id)
+        assert np.allclose(daily.totals[user, day], values), (user_id, day)
+    for user, user_id in enumerate(daily.user_ids[:100].tolist()):
+        assert np.allclose(vector_rolling[user], rolling[user_id])
+        assert np.allclose(vector_percentiles[user], percentiles[user_id])
+
+
+def populate_database(db: Session, meals: MealArrays, matrix: np.ndarray, users: int, chunk: int):
+    db.execute(User.__table__.insert(), [
+        {"id": user_id, "email": f"user{user_id}@example.com", "hashed_password": "x"}
+        for user_id in range(1, users + 1)
+    ])
+    db.execute(Food.__table__.insert(), [
+        {
+            "id": food_id, "name": f"Food {food_id}", "unit_type": "serving", "unit_size_description": "1 serving",
+            **dict(zip(("calories_per_unit", "protein_g", "carbs_g", "fats_g"), row)),
+        }
+        for food_id, row in enumerate(matrix.tolist()) if food_id
+    ])
+    rng = np.random.default_rng(0)
+    # Spread meals over the day so logged_at has to be truncated like real data
+    logged_at = meals.day.astype("datetime64[s]") + rng.integers(0, 86400, len(meals.day))
+    for offset in range(0, len(meals.quantity), chunk):
+        part = slice(offset, offset + chunk)
+        db.execute(Meal.__table__.insert(), [
+            {"user_id": user_id, "food_id": food_id, "meal_type": MEAL_TYPES[code], "quantity": quantity, "logged_at": at}
+            for user_id, food_id, code, quantity, at in zip(
+                meals.user_id[part].tolist(), meals.food_id[part].tolist(), meals.meal_type[part].tolist(),
+                meals.quantity[part].tolist(), logged_at[part].astype(datetime).tolist(),
+            )
+        ])
+    db.commit()
+
+
+def loop_from_database(db: Session, start: date, end: date):
+    """Per (user, day) totals from SQLAlchemy rows, the way get_daily_stats sums one day"""
+    begin = time.perf_counter()
+    foods = {
+        food_id: nutrients for food_id, *nutrients in
+        db.execute(select(Food.id, Food.calories_per_unit, Food.protein_g, Food.carbs_g, Food.fats_g))
+    }
+    rows = db.execute(select(Meal.user_id, Meal.logged_at, Meal.food_id, Meal.quantity).where(
+        Meal.logged_at >= datetime.combine(start, datetime.min.time()),
+        Meal.logged_at < datetime.combine(end + timedelta(days=1), datetime.min.time()),
+    ))
+    totals = {}
+    for user_id, logged_at, food_id, quantity in rows:
+        calories, protein, carbs, fats = foods[food_id]
+        key = (user_id, logged_at.date())
+        day_totals = totals.get(key)
+        if day_totals is None:
+            day_totals = totals[key] = [0.0, 0.0, 0.0, 0.0]
+        day_totals[0] += calories * quantity
+        day_totals[1] += protein * quantity
+        day_totals[2] += carbs * quantity
+        day_totals[3] += fats * quantity
+    return totals, time.perf_counter() - begin
+
+
+def vectorized_from_database(db: Session, start: date, end: date):
+    begin = time.perf_counter()
+    meals = load_meal_arrays(db, start, end)
+    timings = {"load meals": time.perf_counter() - begin}
+
+    begin = time.perf_counter()
+    matrix = NutrientMatrix.build(db)
+    timings["nutrient matrix"] = time.perf_counter() - begin
+
+    begin = time.perf_counter()
+    daily = daily_totals(meals, matrix, start, end)
+    timings["daily totals"] = time.perf_counter() - begin
+    return daily, timings
+
+
+def database_benchmark(meals: MealArrays, matrix: np.ndarray, users: int, start: date, end: date, chunk: int):
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{os.path.join(directory, 'analytics.db')}")
+        init_schema(engine)
+        with Session(engine) as db:
+            begin = time.perf_counter()
+            populate_database(db, meals, matrix, users, chunk)
+            print(f"\nSQLite, {len(meals.quantity):,} meals written in {time.perf_counter() - begin:.1f} s; "
+                  f"per-user daily totals including the load:")
+
+            daily, timings = vectorized_from_database(db, start, end)
+            totals, loop = loop_from_database(db, start, end)
+        engine.dispose()
+
+    for (user_id, day), values in list(totals.items())[:10000]:
+        user = np.searchsorted(daily.user_ids, user_id)
+        assert np.allclose(daily.totals[user, (day - start).days], values), (user_id, day)
+
+    vectorized = sum(timings.values())
+    for step, seconds in timings.items():
+        print(f"  vectorized {step:<16}{seconds * 1000:>10.1f} ms")
+    print(f"{'loop':<10}{loop:>10.2f} s  ({loop * 1e9 / len(meals.quantity):,.0f} ns/meal)")
+    print(f"{'vectorized':<10}{vectorized:>10.2f} s  ({vectorized * 1e9 / len(meals.quantity):,.0f} ns/meal)")
+    print(f"speedup   {loop / vectorized:>10.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--meals", type=int, default=10_000_000)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--foods", type=int, default=1000)
+    parser.add_argument("--chunk", type=int, default=1_000_000, help="Rows converted to Python objects at a time for the loop")
+    parser.add_argument("--db-meals", type=int, default=1_000_000, help="Meals for the database part (0 skips it)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    start = date(2024, 1, 1)
+    end = start + timedelta(days=args.days - 1)
+    meals = synthetic_meals(args.meals, args.users, args.days, args.foods, start, args.seed)
+    matrix = synthetic_matrix(args.foods, args.seed)
+    print(f"{args.meals:,} meals, {args.users} users, {args.days} days, {args.foods} foods")
+
+    vector_result, timings = vectorized_analytics(meals, matrix, start, end)
+    vectorized = sum(timings.values())
+    loop_result, loop = loop_analytics(meals, matrix, start, args.days, args.chunk)
+    check(loop_result, vector_result)
+
+    for step, seconds in timings.items():
+        print(f"  vectorized {step:<14}{seconds * 1000:>10.1f} ms")
+    print(f"{'loop':<10}{loop:>10.2f} s  ({loop * 1e9 / args.meals:,.0f} ns/meal)")
+    print(f"{'vectorized':<10}{vectorized:>10.2f} s  ({vectorized * 1e9 / args.meals:,.0f} ns/meal)")
+    print(f"speedup   {loop / vectorized:>10.1f}x")
+
+    if args.db_meals:
+        db_meals = MealArrays(*[column[:args.db_meals] for column in meals])
+        if len(db_meals.quantity) < args.db_meals:
+            db_meals = synthetic_meals(args.db_meals, args.users, args.days, args.foods, start, args.seed)
+        database_benchmark(db_meals, matrix, args.users, start, end, args.chunk)
+
+
+if __name__ == "__main__":
+    main()
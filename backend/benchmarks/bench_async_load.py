@@ -0,0 +1,157 @@
+"""
+Load benchmark: threadpool (sync) vs. SQLAlchemy asyncio database mode
+
+Usage:
+    python benchmarks/bench_async_load.py [--clients 50 200 1000] [--duration 10]
+
+Boots the API under uvicorn once per mode against a throwaway SQLite
+database (aiosqlite in async mode), then has N concurrent clients refresh
+/meals/today + /meals/stats/today in a loop. Requires httpx and uvicorn.
+"""
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ROUTES = ("/meals/today", "/meals/stats/today")
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def init_database(database_url: str):
+    subprocess.run(
+        [sys.executable, os.path.join("scripts", "init_db.py")],
+        cwd=BACKEND_DIR,
+        env={**os.environ, "DATABASE_URL": database_url},
+        check=True,
+        stdout=subprocess.DEVNULL,
+    )
+
+
+def start_server(database_url: str, async_mode: bool, port: int) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "DATABASE_URL": database_url,
+        "DATABASE_ASYNC": "true" if async_mode else "false",
+    }
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR,
+        env=env,
+    )
+
+
+async def wait_until_up(client: httpx.AsyncClient, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if (await client.get("/health")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.1)
+    raise RuntimeError("Server did not start")
+
+
+async def seed(client: httpx.AsyncClient, users: int, meals_per_user: int) -> list:
+    await client.post("/seed/foods")
+    tokens = []
+    for i in range(users):
+        response = await client.post("/auth/signup", json={
+            "email": f"load{i}@example.com", "password": "benchmark", "daily_calorie_goal": 2000
+        })
+        token = response.json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        for j in range(meals_per_user):
+            await client.post("/meals", headers=headers, json={
+                "food_id": 1 + j % 50, "meal_type": "lunch", "quantity": 1
+            })
+        tokens.append(headers)
+    return tokens
+
+
+async def client_loop(client, headers, stop_at, latencies, errors):
+    while time.monotonic() < stop_at:
+        for route in ROUTES:
+            start = time.perf_counter()
+            try:
+                response = await client.get(route, headers=headers)
+                if response.status_code != 200:
+                    errors.append(response.status_code)
+                    continue
+            except httpx.HTTPError as exc:
+                errors.append(type(exc).__name__)
+                continue
+            latencies.append(time.perf_counter() - start)
+
+
+async def run_level(base_url: str, tokens: list, clients: int, duration: float) -> dict:
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        latencies, errors = [], []
+        stop_at = time.monotonic() + duration
+        await asyncio.gather(*[
+            client_loop(client, tokens[i % len(tokens)], stop_at, latencies, errors)
+            for i in range(clients)
+        ])
+
+    latencies.sort()
+    quantiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else [0.0] * 99
+    return {
+        "clients": clients,
+        "requests": len(latencies),
+        "errors": len(errors),
+        "rps": len(latencies) / duration,
+        "p50_ms": quantiles[49] * 1000,
+        "p95_ms": quantiles[94] * 1000,
+    }
+
+
+async def bench_mode(async_mode: bool, args) -> list:
+    with tempfile.TemporaryDirectory() as tmp:
+        port = free_port()
+        base_url = f"http://127.0.0.1:{port}"
+        database_url = f"sqlite:///{os.path.join(tmp, 'load.db')}"
+        init_database(database_url)
+        server = start_server(database_url, async_mode, port)
+        try:
+            async with httpx.AsyncClient(base_url=base_url, timeout=60) as client:
+                await wait_until_up(client)
+                tokens = await seed(client, args.users, args.meals_per_user)
+            return [await run_level(base_url, tokens, clients, args.duration) for clients in args.clients]
+        finally:
+            server.terminate()
+            server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--clients", type=int, nargs="+", default=[50, 200, 1000])
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--meals-per-user", type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"{'mode':<8}{'clients':>8}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'errors':>8}")
+    for async_mode in (False, True):
+        for row in asyncio.run(bench_mode(async_mode, args)):
+            print(
+                f"{'async' if async_mode else 'sync':<8}{row['clients']:>8}{row['rps']:>10.0f}"
+                f"{row['p50_ms']:>10.1f}{row['p95_ms']:>10.1f}{row['errors']:>8}"
+            )
+
+
+if __name__ == "__main__":
+    main()
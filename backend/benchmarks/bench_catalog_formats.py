@@ -0,0 +1,67 @@
+"""
+Benchmark: size and decode time of the catalog's JSON and compact binary forms
+
+Usage:
+    python benchmarks/bench_catalog_formats.py [--foods 1000] [--rounds 5]
+
+Encodes a synthetic catalog both ways, as GET /foods serves it, and reports
+the payload size plain and gzipped plus how long a client needs to decode
+it: JSON with json.loads, the binary form into per-field columns (what a
+typed-array client does) and on into per-food dicts with the reference
+decoder.
+"""
+import argparse
+import gzip
+import json
+import os
+import random
+import sys
+import time
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.loadtest.data import synthetic_foods
+from app.utils.catalog_binary import decode_catalog, decode_catalog_columns, encode_catalog
+
+
+def best_of(fn, rounds: int) -> float:
+    """Best-of-rounds milliseconds"""
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--foods", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    foods = [
+        {"id": i, **food}
+        for i, food in enumerate(synthetic_foods(args.foods, random.Random(args.seed)), 1)
+    ]
+    body = json.dumps(foods, separators=(",", ":")).encode("utf-8")
+    binary = encode_catalog(foods)
+    assert decode_catalog(binary) == foods
+
+    print(f"{args.foods} foods")
+    print(f"{'format':<10}{'bytes':>10}{'gzip bytes':>12}{'decode':>10}{'ms':>8}")
+    cases = [
+        ("json", body, "dicts", json.loads),
+        ("binary", binary, "columns", decode_catalog_columns),
+        ("binary", binary, "dicts", decode_catalog),
+    ]
+    for name, payload, into, decode in cases:
+        compressed = len(gzip.compress(payload, compresslevel=9))
+        elapsed = best_of(lambda: decode(payload), args.rounds)
+        print(f"{name:<10}{len(payload):>10}{compressed:>12}{into:>10}{elapsed:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Benchmark: in-memory food search index vs. the old ILIKE '%term%' scan
+
+Usage:
+    python benchmarks/bench_food_search.py [--sizes 1000 100000 1000000]
+
+Runs against a throwaway SQLite database, so no Postgres is needed.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models.food import Food
+from app.utils.food_search import FoodSearchIndex
+
+WORDS = [
+    "aloo", "paneer", "dal", "masala", "tikka", "butter", "chicken", "palak",
+    "rice", "jeera", "biryani", "roti", "paratha", "naan", "chana", "rajma",
+    "sambhar", "dosa", "idli", "upma", "poha", "halwa", "kheer", "lassi",
+    "gobi", "bhindi", "baingan", "mutton", "fish", "curry", "kofta", "korma",
+]
+UNITS = ["katori", "piece", "cup", "tablespoon", "100g"]
+QUERIES = ["pan", "paneer", "dal mas", "chicken tikka", "xyz", "a", "rice"]
+
+
+def synthetic_foods(count: int, seed: int = 42):
+    """Yield food dicts with realistic multi-word names"""
+    rng = random.Random(seed)
+    for i in range(count):
+        name = " ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 3)))
+        yield {
+            "name": f"{name.title()} #{i}",
+            "calories_per_unit": rng.uniform(20, 500),
+            "protein_g": rng.uniform(0, 30),
+            "carbs_g": rng.uniform(0, 80),
+            "fats_g": rng.uniform(0, 30),
+            "unit_type": rng.choice(UNITS),
+            "unit_size_description": "1 serving",
+        }
+
+
+def load_foods(session, count: int, batch_size: int = 50_000):
+    batch = []
+    for food in synthetic_foods(count):
+        batch.append(food)
+        if len(batch) >= batch_size:
+            session.execute(Food.__table__.insert(), batch)
+            batch.clear()
+    if batch:
+        session.execute(Food.__table__.insert(), batch)
+    session.commit()
+
+
+def time_it(fn, repeat: int) -> float:
+    """Return mean milliseconds per call"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def run(size: int, repeat: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        Session = sessionmaker(bind=engine)
+        db = Session()
+
+        load_foods(db, size)
+
+        index = FoodSearchIndex()
+        start = time.perf_counter()
+        index.rebuild(db)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        print(f"\n{size:,} foods (index build: {build_ms:,.0f} ms)")
+        print(f"  {'query':<16}{'ilike ms':>12}{'index ms':>12}{'speedup':>10}{'hits':>10}")
+        for term in QUERIES:
+            ilike_ms = time_it(
+                lambda: db.query(Food).filter(Food.name.ilike(f"%{term}%")).all(),
+                repeat,
+            )
+            index_ms = time_it(lambda: index.search(term), repeat)
+            hits = len(index.search(term))
+            print(
+                f"  {term!r:<16}{ilike_ms:>12.3f}{index_ms:>12.3f}"
+                f"{ilike_ms / max(index_ms, 1e-6):>9.1f}x{hits:>10,}"
+            )
+
+        db.close()
+        engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        run(size, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Benchmark: date(logged_at) = :day vs. a half-open range on (user_id, logged_at)
+
+Usage:
+    python benchmarks/bench_meal_day_filter.py [--rows 10000000] [--users 10000]
+    python benchmarks/bench_meal_day_filter.py --database-url postgresql://...
+
+Prints the query plan and mean latency for each filter, before and after the
+composite index is created. Defaults to a throwaway SQLite database.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, func, text
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models.food import Food
+from app.models.meal import Meal
+from app.models.user import User
+
+COMPOSITE_INDEX = "ix_meals_user_id_logged_at"
+MEAL_TYPES = ["breakfast", "lunch", "dinner", "snacks"]
+
+
+def seed(session, rows: int, users: int, days: int, batch_size: int = 100_000):
+    rng = random.Random(7)
+    session.execute(User.__table__.insert(), [
+        {"id": i, "email": f"user{i}@bench.local", "hashed_password": "x", "daily_calorie_goal": 2000}
+        for i in range(1, users + 1)
+    ])
+    session.execute(Food.__table__.insert(), [
+        {"id": i, "name": f"Food {i}", "calories_per_unit": 100, "protein_g": 1, "carbs_g": 1,
+         "fats_g": 1, "unit_type": "piece", "unit_size_description": "1 piece"}
+        for i in range(1, 101)
+    ])
+
+    first_day = datetime.combine(date.today() - timedelta(days=days - 1), datetime.min.time())
+    batch = []
+    for _ in range(rows):
+        batch.append({
+            "user_id": rng.randint(1, users),
+            "food_id": rng.randint(1, 100),
+            "meal_type": rng.choice(MEAL_TYPES),
+            "quantity": 1.0,
+            "logged_at": first_day + timedelta(seconds=rng.randrange(days * 86400)),
+        })
+        if len(batch) >= batch_size:
+            session.execute(Meal.__table__.insert(), batch)
+            batch.clear()
+    if batch:
+        session.execute(Meal.__table__.insert(), batch)
+    session.commit()
+
+
+def explain(session, query) -> str:
+    sql = query.statement.compile(session.get_bind(), compile_kwargs={"literal_binds": True})
+    if session.get_bind().dialect.name == "sqlite":
+        rows = session.execute(text(f"EXPLAIN QUERY PLAN {sql}")).fetchall()
+        return "\n".join(f"    {row[-1]}" for row in rows)
+    rows = session.execute(text(f"EXPLAIN ANALYZE {sql}")).fetchall()
+    return "\n".join(f"    {row[0]}" for row in rows)
+
+
+def timed(query, repeat: int) -> float:
+    """Mean milliseconds per execution"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        query.all()
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def report(session, user_id: int, day: date, repeat: int):
+    day_start = datetime.combine(day, datetime.min.time())
+    day_end = day_start + timedelta(days=1)
+    filters = {
+        "func.date(logged_at) == day": session.query(Meal).filter(
+            Meal.user_id == user_id, func.date(Meal.logged_at) == day
+        ),
+        "logged_at in [day, day + 1)": session.query(Meal).filter(
+            Meal.user_id == user_id, Meal.logged_at >= day_start, Meal.logged_at < day_end
+        ),
+    }
+    for label, query in filters.items():
+        ms = timed(query, repeat)
+        print(f"  {label:<32}{ms:>10.3f} ms  ({query.count()} rows)")
+        print(explain(session, query))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--database-url", default=None, help="Seed this (empty) database instead of a temporary SQLite file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = args.database_url or f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        engine = create_engine(url)
+        Base.metadata.create_all(bind=engine)
+        Session = sessionmaker(bind=engine)
+        session = Session()
+
+        print(f"Seeding {args.rows:,} meals for {args.users:,} users over {args.days} days...")
+        start = time.perf_counter()
+        seed(session, args.rows, args.users, args.days)
+        print(f"  done in {time.perf_counter() - start:.1f} s")
+
+        user_id = random.Random(1).randint(1, args.users)
+        day = date.today() - timedelta(days=args.days // 2)
+
+        # Start from the old schema: only the single-column logged_at index
+        session.execute(text(f"DROP INDEX IF EXISTS {COMPOSITE_INDEX}"))
+        session.commit()
+        session.execute(text("ANALYZE"))
+        print(f"\nWithout {COMPOSITE_INDEX}:")
+        report(session, user_id, day, args.repeat)
+
+        next(
+            index for index in Meal.__table__.indexes if index.name == COMPOSITE_INDEX
+        ).create(bind=session.connection())
+        session.commit()
+        session.execute(text("ANALYZE"))
+        print(f"\nWith {COMPOSITE_INDEX}:")
+        report(session, user_id, day, args.repeat)
+
+        session.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Micro-benchmark: per-item cost of serializing list responses
+
+Usage:
+    python benchmarks/bench_serialization.py [--items 1000] [--rounds 5]
+
+Times turning a loaded list into response bytes, without a server or a
+database, for the three ways a route can return it:
+
+  before      models built in the route, then FastAPI's response_model
+              validation and serialization, then json.dumps (JSONResponse)
+  orjson      the same validation, encoded by ORJSONResponse (what the app's
+              default response class now does for routes returning models)
+  direct      plain dicts built in the route and returned as ORJSONResponse,
+              which skips response_model validation altogether
+
+Meals are what GET /meals/today returns, foods what a paged GET /foods does.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.models.food import Food
+from app.models.meal import MEAL_TYPES, Meal
+from app.models.user import User  # noqa: F401  (configures the Meal.user relationship)
+from app.schemas.food import FoodResponse
+from app.schemas.meal import MealResponse
+from app.utils.food_search import FOOD_FIELDS
+from app.utils.serialization import meals_payload
+
+DISTINCT_FOODS = 50
+
+
+def make_foods(count: int) -> List[Food]:
+    return [
+        Food(
+            id=i, name=f"Food number {i}", calories_per_unit=100.0 + i, protein_g=3.5, carbs_g=15.25,
+            fats_g=0.4, unit_type="katori", unit_size_description="1 medium katori (150g)",
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+def make_meals(count: int, foods: List[Food]) -> List[Meal]:
+    start = datetime(2024, 1, 1, 8, 0, 0, 123456)
+    meals = []
+    for i in range(count):
+        food = foods[i % len(foods)]
+        meal = Meal(id=i + 1, food_id=food.id, meal_type=MEAL_TYPES[i % 4], quantity=1.5, logged_at=start + timedelta(minutes=i))
+        meal.food = food
+        meals.append(meal)
+    return meals
+
+
+def fastapi_render(field, content, response_class) -> bytes:
+    """What FastAPI does with a route's return value when it has a response_model"""
+    data = asyncio.run(serialize_response(field=field, response_content=content))
+    return response_class(data).body
+
+
+def meals_before(meals, field, response_class=JSONResponse) -> bytes:
+    content = [
+        MealResponse(
+            id=meal.id, food=meal.food, meal_type=meal.meal_type, quantity=meal.quantity,
+            logged_at=meal.logged_at, total_calories=meal.food.calories_per_unit * meal.quantity,
+        )
+        for meal in meals
+    ]
+    return fastapi_render(field, content, response_class)
+
+
+def meals_direct(meals, field) -> bytes:
+    return ORJSONResponse(meals_payload(meals)).body
+
+
+def foods_before(foods, field, response_class=JSONResponse) -> bytes:
+    return fastapi_render(field, foods, response_class)
+
+
+def foods_direct(rows, field) -> bytes:
+    return ORJSONResponse([dict(zip(FOOD_FIELDS, row)) for row in rows]).body
+
+
+def time_per_item(fn, content, field, items: int, rounds: int) -> float:
+    """Best-of-rounds microseconds per list item"""
+    fn(content, field)
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn(content, field)
+        best = min(best, time.perf_counter() - start)
+    return best * 1e6 / items
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--items", type=int, default=1000, help="List length")
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    foods = make_foods(args.items)
+    food_rows = [tuple(getattr(food, name) for name in FOOD_FIELDS) for food in foods]
+    meals = make_meals(args.items, foods[:DISTINCT_FOODS])
+    meal_field = create_response_field("Response_meals", List[MealResponse], mode="serialization")
+    food_field = create_response_field("Response_foods", List[FoodResponse], mode="serialization")
+
+    # Every path must produce the same documents (key order aside)
+    assert json.loads(meals_before(meals, meal_field)) == json.loads(meals_direct(meals, meal_field))
+    assert json.loads(foods_before(foods, food_field)) == json.loads(foods_direct(food_rows, food_field))
+
+    cases = {
+        "meals": [
+            ("before", lambda c, f: meals_before(c, f), meals),
+            ("orjson", lambda c, f: meals_before(c, f, ORJSONResponse), meals),
+            ("direct", meals_direct, meals),
+        ],
+        "foods": [
+            ("before", lambda c, f: foods_before(c, f), foods),
+            ("orjson", lambda c, f: foods_before(c, f, ORJSONResponse), foods),
+            ("direct", foods_direct, food_rows),
+        ],
+    }
+    fields = {"meals": meal_field, "foods": food_field}
+
+    print(f"{args.items} items per list, best of {args.rounds}")
+    print(f"{'µs/item':<10}{'before':>10}{'orjson':>10}{'direct':>10}{'speedup':>10}")
+    for name, variants in cases.items():
+        results = [time_per_item(fn, content, fields[name], args.items, args.rounds) for _, fn, content in variants]
+        print(f"{name:<10}" + "".join(f"{value:>10.2f}" for value in results) + f"{results[0] / results[-1]:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
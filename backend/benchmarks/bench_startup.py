@@ -0,0 +1,117 @@
+"""
+Cold start benchmark: import time and time-to-first-response per worker
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 5] [--async] [--database-url URL]
+
+Each run starts a fresh interpreter, so nothing is warm except the OS page
+cache. "import" is the time to `import app.main`; "first response" is the
+time from spawning a single uvicorn worker until /health answers 200, which
+is what an autoscaler waits for. Without --database-url a throwaway SQLite
+database is created and seeded with scripts/init_db.py. Requires httpx and
+uvicorn.
+"""
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_SNIPPET = (
+    "import time; start = time.perf_counter(); import app.main; "
+    "print(time.perf_counter() - start)"
+)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure_import(env: dict) -> float:
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_SNIPPET], cwd=BACKEND_DIR, env=env,
+        check=True, capture_output=True, text=True,
+    ).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def measure_first_response(env: dict, timeout: float = 60.0) -> float:
+    port = free_port()
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR,
+        env=env,
+    )
+    try:
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=1.0) as client:
+            while time.perf_counter() - start < timeout:
+                if server.poll() is not None:
+                    raise RuntimeError("Server exited during startup")
+                try:
+                    if client.get("/health").status_code == 200:
+                        return time.perf_counter() - start
+                except httpx.TransportError:
+                    pass
+                time.sleep(0.005)
+        raise RuntimeError("Server did not start")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def summarize(label: str, samples: list):
+    print(
+        f"{label:<16}{statistics.median(samples) * 1000:>10.0f}"
+        f"{min(samples) * 1000:>10.0f}{max(samples) * 1000:>10.0f}"
+    )
+
+
+def run(database_url: str, args):
+    env = {
+        **os.environ,
+        "DATABASE_URL": database_url,
+        "DATABASE_ASYNC": "true" if args.use_async else "false",
+    }
+    imports = [measure_import(env) for _ in range(args.runs)]
+    first_responses = [measure_first_response(env) for _ in range(args.runs)]
+
+    print(f"{'ms':<16}{'median':>10}{'min':>10}{'max':>10}")
+    summarize("import", imports)
+    summarize("first response", first_responses)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--async", dest="use_async", action="store_true", help="Use the asyncio database mode")
+    parser.add_argument("--database-url", default=None, help="Existing, initialised database to start against")
+    args = parser.parse_args()
+
+    if args.database_url:
+        run(args.database_url, args)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = f"sqlite:///{os.path.join(tmp, 'startup.db')}"
+        subprocess.run(
+            [sys.executable, os.path.join("scripts", "init_db.py"), "--seed"],
+            cwd=BACKEND_DIR,
+            env={**os.environ, "DATABASE_URL": database_url},
+            check=True,
+            stdout=subprocess.DEVNULL,
+        )
+        run(database_url, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Regression check: the "today" routes run a constant number of queries
+
+Usage:
+    python benchmarks/check_query_counts.py [--async] [--meals 1 10 50]
+
+Logs a growing number of meals (spread over several foods) for fresh users
+against a throwaway SQLite database and counts the SQL statements each of
+/meals/today, /meals/stats/today and /meals/dashboard/today runs. Fails
+(exit 1) if a count grows with the number of meals, i.e. an N+1 query crept
+back in, or exceeds the route's @query_budget.
+"""
+import argparse
+import os
+import sys
+import tempfile
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+ROUTES = ("/meals/today", "/meals/stats/today", "/meals/dashboard/today")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Check that the today routes don't run N+1 queries")
+    parser.add_argument("--async", dest="async_mode", action="store_true", help="Use DATABASE_ASYNC mode")
+    parser.add_argument("--meals", type=int, nargs="+", default=[1, 10, 50])
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    # Settings are read at import time, so the database must be chosen first
+    directory = tempfile.mkdtemp()
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(directory, 'query_counts.db')}"
+    os.environ["DATABASE_ASYNC"] = "true" if args.async_mode else "false"
+
+    from fastapi.testclient import TestClient
+    from app.database import engine
+    from app.main import app
+    from app.utils.query_counter import assert_max_queries
+    from app.utils.schema import init_schema
+
+    init_schema(engine)
+    budgets = {route.path: route.endpoint.query_budget for route in app.routes if route.path in ROUTES}
+
+    failures = []
+    with TestClient(app) as client:
+        client.post("/seed/foods")
+        food_ids = None
+
+        counts = {route: [] for route in ROUTES}
+        for user, meals in enumerate(args.meals):
+            token = client.post(
+                "/auth/signup", json={"email": f"user{user}@example.com", "password": "password"}
+            ).json()["access_token"]
+            headers = {"Authorization": f"Bearer {token}"}
+            if food_ids is None:
+                food_ids = [food["id"] for food in client.get("/foods", params={"limit": 20}, headers=headers).json()]
+            for i in range(meals):
+                client.post(
+                    "/meals",
+                    json={"food_id": food_ids[i % len(food_ids)], "meal_type": "lunch", "quantity": 1},
+                    headers=headers,
+                )
+
+            for route in ROUTES:
+                # Warm the user cache so only the route's own queries are counted
+                client.get(route, headers=headers)
+                try:
+                    with assert_max_queries(budgets[route]) as counter:
+                        response = client.get(route, headers=headers)
+                except AssertionError as e:
+                    failures.append(f"{route} with {meals} meals: {e}")
+                    continue
+                response.raise_for_status()
+                counts[route].append(counter.count)
+
+    print(f"{'route':<26}" + "".join(f"{meals:>8} meals" for meals in args.meals) + "    budget")
+    for route, route_counts in counts.items():
+        print(f"{route:<26}" + "".join(f"{count:>14}" for count in route_counts) + f"{budgets[route]:>10}")
+        if len(set(route_counts)) > 1:
+            failures.append(f"{route}: query count grows with the number of meals {route_counts}")
+
+    for failure in failures:
+        print(f"❌ {failure}")
+    if failures:
+        sys.exit(1)
+    print("✅ Query counts are constant")
+
+
+if __name__ == "__main__":
+    main()
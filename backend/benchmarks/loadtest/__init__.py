@@ -0,0 +1,14 @@
+"""
+Reproducible API load test
+
+Usage (from backend/):
+    python -m benchmarks.loadtest [--clients 50] [--duration 30] [--output results.json]
+    python -m benchmarks.loadtest --database-url postgresql://... --async
+    python -m benchmarks.loadtest.compare before.json after.json
+
+Boots the API under uvicorn against a throwaway SQLite database (or the
+given one), seeds synthetic users, foods and meals, then has N virtual users
+run a weighted mix of login, search-as-you-type, meal logging and dashboard
+refreshes. Reports p50/p95/p99 latency and throughput per route and writes
+them as JSON. Requires httpx and uvicorn.
+"""
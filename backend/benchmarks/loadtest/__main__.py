@@ -0,0 +1,196 @@
+import argparse
+import asyncio
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timezone
+
+import httpx
+
+from . import __doc__ as USAGE
+from .scenarios import DEFAULT_MIX, virtual_user
+from .stats import PERCENTILES, Recorder
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Seeding imports the app directly
+sys.path.append(BACKEND_DIR)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def git_revision() -> dict:
+    def git(*args):
+        return subprocess.run(
+            ["git", *args], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+
+    try:
+        return {"commit": git("rev-parse", "HEAD"), "dirty": bool(git("status", "--porcelain", "--", "."))}
+    except (OSError, subprocess.CalledProcessError):
+        return {"commit": None, "dirty": None}
+
+
+def parse_mix(value: str) -> dict:
+    """'login=1,search=4' -> {"login": 1, "search": 4}"""
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        if name not in DEFAULT_MIX:
+            raise argparse.ArgumentTypeError(f"Unknown action '{name}', expected one of {', '.join(DEFAULT_MIX)}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def start_server(database_url: str, async_mode: bool, workers: int, port: int) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "DATABASE_URL": database_url,
+        "DATABASE_ASYNC": "true" if async_mode else "false",
+    }
+    return subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port),
+            "--workers", str(workers), "--log-level", "warning",
+        ],
+        cwd=BACKEND_DIR,
+        env=env,
+    )
+
+
+def stop_server(server: subprocess.Popen):
+    server.terminate()
+    try:
+        server.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        server.kill()
+        server.wait()
+
+
+async def wait_until_up(base_url: str, timeout: float = 60.0):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get("/health")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.1)
+    raise RuntimeError("Server did not start")
+
+
+async def drive(base_url: str, accounts: list, args) -> dict:
+    """Run the mix with a warmup that is not recorded; returns the summary"""
+    recorder = Recorder()
+    recorder.enabled = False
+    limits = httpx.Limits(max_connections=args.clients, max_keepalive_connections=args.clients)
+    stop_at = time.monotonic() + args.warmup + args.duration
+
+    async def end_warmup():
+        await asyncio.sleep(args.warmup)
+        recorder.enabled = True
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        await asyncio.gather(end_warmup(), *[
+            virtual_user(client, recorder, accounts[i % len(accounts)], args.mix, stop_at, args.seed + i)
+            for i in range(args.clients)
+        ])
+    return recorder.summary(args.duration)
+
+
+def print_summary(summary: dict):
+    columns = "".join(f"{f'p{pct} ms':>10}" for pct in PERCENTILES)
+    print(f"{'route':<26}{'req/s':>10}{columns}{'errors':>8}")
+    for route, stats in [*summary["routes"].items(), ("TOTAL", summary["total"])]:
+        values = "".join(f"{stats[f'p{pct}_ms']:>10.1f}" for pct in PERCENTILES)
+        print(f"{route:<26}{stats['rps']:>10.1f}{values}{stats['errors']:>8}")
+
+
+def run(database_url: str, args) -> dict:
+    # app.database reads DATABASE_URL when first imported, which seeding does
+    os.environ["DATABASE_URL"] = database_url
+    from .seed import seed
+
+    run_id = uuid.uuid4().hex[:8]
+    print(f"Seeding {args.users} users, {args.foods} foods, {args.meals_per_user} meals per user...")
+    accounts, food_ids = seed(run_id, args.users, args.foods, args.meals_per_user, args.days, args.seed)
+    for account in accounts:
+        account["headers"] = {"Authorization": f"Bearer {account['token']}"}
+        account["food_ids"] = food_ids
+
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    server = start_server(database_url, args.use_async, args.workers, port)
+    try:
+        asyncio.run(wait_until_up(base_url))
+        print(f"Running {args.clients} clients for {args.duration:g}s (+{args.warmup:g}s warmup)...")
+        summary = asyncio.run(drive(base_url, accounts, args))
+    finally:
+        stop_server(server)
+
+    return {
+        "meta": {
+            **git_revision(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "database": database_url.split(":", 1)[0],
+            "async": args.use_async,
+            "workers": args.workers,
+            "clients": args.clients,
+            "duration_s": args.duration,
+            "warmup_s": args.warmup,
+            "users": args.users,
+            "foods": args.foods,
+            "meals_per_user": args.meals_per_user,
+            "seed": args.seed,
+            "mix": args.mix,
+        },
+        **summary,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=USAGE.strip().splitlines()[0])
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--warmup", type=float, default=5.0)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--async", dest="use_async", action="store_true", help="Use the asyncio database mode")
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--foods", type=int, default=1000)
+    parser.add_argument("--meals-per-user", type=int, default=200)
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--mix", type=parse_mix, default=DEFAULT_MIX, help="e.g. login=1,search=4,log_meal=2,refresh=3")
+    parser.add_argument("--database-url", default=None, help="Seed and test against this database instead of SQLite")
+    parser.add_argument("--output", default=None, help="Write the JSON results here")
+    args = parser.parse_args()
+
+    if args.database_url:
+        results = run(args.database_url, args)
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            results = run(f"sqlite:///{os.path.join(tmp, 'loadtest.db')}", args)
+
+    print_summary(results)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Compare two load test result files
+
+Usage:
+    python -m benchmarks.loadtest.compare before.json after.json [--threshold 10]
+
+Prints per-route throughput and latency percentiles side by side with the
+relative change. Exits 1 if any route's p95 got slower by more than
+--threshold percent.
+"""
+import argparse
+import json
+import sys
+
+from .stats import PERCENTILES
+
+METRICS = ("rps", *(f"p{pct}_ms" for pct in PERCENTILES))
+
+
+def change(before: float, after: float) -> float:
+    return (after - before) / before * 100 if before else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("before")
+    parser.add_argument("after")
+    parser.add_argument("--threshold", type=float, default=10.0, help="Allowed p95 slowdown in percent")
+    args = parser.parse_args()
+
+    with open(args.before) as f:
+        before = json.load(f)
+    with open(args.after) as f:
+        after = json.load(f)
+
+    for label, results in (("before", before), ("after", after)):
+        meta = results["meta"]
+        print(f"{label:<8}{(meta.get('commit') or 'unknown')[:12]}{' (dirty)' if meta.get('dirty') else ''}")
+
+    regressions = []
+    print(f"\n{'route':<26}{'metric':<8}{'before':>10}{'after':>10}{'change':>9}")
+    routes = sorted(set(before["routes"]) & set(after["routes"]))
+    for route in [*routes, "TOTAL"]:
+        old = before["total"] if route == "TOTAL" else before["routes"][route]
+        new = after["total"] if route == "TOTAL" else after["routes"][route]
+        for metric in METRICS:
+            delta = change(old[metric], new[metric])
+            print(f"{route:<26}{metric:<8}{old[metric]:>10.1f}{new[metric]:>10.1f}{delta:>+8.1f}%")
+            if metric == "p95_ms" and delta > args.threshold:
+                regressions.append(route)
+
+    if regressions:
+        print(f"\np95 regressed by more than {args.threshold:g}% on: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
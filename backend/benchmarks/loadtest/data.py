@@ -0,0 +1,26 @@
+"""Synthetic data shapes shared by the seeder and the scenarios (no app imports)"""
+import random
+
+# Shared by every seeded user, so the login scenario knows it
+PASSWORD = "loadtest-password"
+
+WORDS = [
+    "aloo", "paneer", "dal", "masala", "tikka", "butter", "chicken", "palak",
+    "rice", "jeera", "biryani", "roti", "paratha", "naan", "chana", "rajma",
+    "sambhar", "dosa", "idli", "upma", "poha", "halwa", "kheer", "lassi",
+]
+MEAL_TYPES = ["breakfast", "lunch", "dinner", "snacks"]
+
+
+def synthetic_foods(count: int, rng: random.Random):
+    for i in range(count):
+        name = " ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 3)))
+        yield {
+            "name": f"{name.title()} #{i}",
+            "calories_per_unit": round(rng.uniform(20, 500), 1),
+            "protein_g": round(rng.uniform(0, 30), 1),
+            "carbs_g": round(rng.uniform(0, 80), 1),
+            "fats_g": round(rng.uniform(0, 30), 1),
+            "unit_type": rng.choice(["katori", "piece", "cup", "100g"]),
+            "unit_size_description": "1 serving",
+        }
@@ -0,0 +1,84 @@
+"""What a virtual user does: a weighted mix of realistic actions"""
+import random
+import time
+
+import httpx
+
+from .data import MEAL_TYPES, PASSWORD, WORDS
+from .stats import Recorder
+
+# Relative weights of each action in the default mix
+DEFAULT_MIX = {
+    "login": 1,
+    "search": 4,
+    "log_meal": 2,
+    "refresh": 3,
+}
+
+
+async def timed_request(client: httpx.AsyncClient, recorder: Recorder, route: str, method: str, url: str, **kwargs):
+    start = time.perf_counter()
+    try:
+        response = await client.request(method, url, **kwargs)
+    except httpx.HTTPError as exc:
+        recorder.record(route, time.perf_counter() - start, error=type(exc).__name__)
+        return None
+    elapsed = time.perf_counter() - start
+    if response.status_code >= 400:
+        recorder.record(route, elapsed, error=str(response.status_code))
+        return None
+    recorder.record(route, elapsed)
+    return response
+
+
+async def login(client, recorder, account, rng):
+    await timed_request(
+        client, recorder, "POST /auth/login", "POST", "/auth/login",
+        json={"email": account["email"], "password": PASSWORD},
+    )
+
+
+async def search(client, recorder, account, rng):
+    """Search-as-you-type: one request per keystroke of a word"""
+    word = rng.choice(WORDS)
+    for length in range(1, len(word) + 1):
+        await timed_request(
+            client, recorder, "GET /foods?search", "GET", "/foods",
+            params={"search": word[:length]}, headers=account["headers"],
+        )
+
+
+async def log_meal(client, recorder, account, rng):
+    await timed_request(
+        client, recorder, "POST /meals", "POST", "/meals",
+        json={
+            "food_id": rng.choice(account["food_ids"]),
+            "meal_type": rng.choice(MEAL_TYPES),
+            "quantity": rng.choice([0.5, 1, 2]),
+        },
+        headers=account["headers"],
+    )
+
+
+async def refresh(client, recorder, account, rng):
+    """What the home screen fetches after every change"""
+    await timed_request(
+        client, recorder, "GET /meals/dashboard/today", "GET", "/meals/dashboard/today", headers=account["headers"]
+    )
+
+
+ACTIONS = {
+    "login": login,
+    "search": search,
+    "log_meal": log_meal,
+    "refresh": refresh,
+}
+
+
+async def virtual_user(client, recorder, account, mix: dict, stop_at: float, seed: int):
+    rng = random.Random(seed)
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    while time.monotonic() < stop_at:
+        action = rng.choices(names, weights)[0]
+        await ACTIONS[action](client, recorder, account, rng)
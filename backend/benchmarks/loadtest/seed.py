@@ -0,0 +1,61 @@
+"""Synthetic data, written straight to the database before the server starts"""
+import random
+from datetime import datetime, timedelta
+from typing import List, Tuple
+
+from app.database import SessionLocal, engine
+from app.models.food import Food
+from app.models.user import User
+from app.utils.auth import _hash_password, create_access_token
+from app.utils.food_loader import load_foods
+from app.utils.meal_import import import_meals
+from app.utils.schema import init_schema
+
+from .data import MEAL_TYPES, PASSWORD, synthetic_foods
+
+
+def seed(
+    run_id: str, users: int, foods: int, meals_per_user: int, days: int, seed_value: int
+) -> Tuple[List[dict], List[int]]:
+    """
+    Create the schema if needed and seed one run's worth of data.
+
+    Emails carry the run id, so seeding an existing database only ever adds
+    rows. Returns one {"id", "email", "token"} dict per user and the ids
+    of every food in the catalog.
+    """
+    rng = random.Random(seed_value)
+    init_schema(engine)
+    db = SessionLocal()
+    try:
+        load_foods(db, synthetic_foods(foods, rng))
+        food_ids = [food_id for (food_id,) in db.query(Food.id)]
+
+        hashed = _hash_password(PASSWORD)
+        emails = [f"loadtest-{run_id}-{i}@example.com" for i in range(users)]
+        db.execute(User.__table__.insert(), [
+            {"email": email, "hashed_password": hashed, "daily_calorie_goal": 2000} for email in emails
+        ])
+        db.commit()
+        accounts = [
+            {"id": user_id, "email": email}
+            for user_id, email in db.query(User.id, User.email).filter(User.email.in_(emails))
+        ]
+
+        # History plus a few meals today, so the dashboard routes have work to do
+        now = datetime.utcnow()
+        for account in accounts:
+            records = (
+                (i, {
+                    "food_id": rng.choice(food_ids),
+                    "meal_type": rng.choice(MEAL_TYPES),
+                    "quantity": rng.choice([0.5, 1, 1.5, 2]),
+                    "logged_at": (now - timedelta(seconds=rng.randrange(days * 86400)) if i % 5 else now).isoformat(),
+                })
+                for i in range(meals_per_user)
+            )
+            import_meals(db, account["id"], records)
+            account["token"] = create_access_token(data={"sub": str(account["id"])})
+        return accounts, food_ids
+    finally:
+        db.close()
@@ -0,0 +1,56 @@
+"""Per-route latency recording and summaries"""
+import math
+from collections import defaultdict
+from typing import Dict, List
+
+PERCENTILES = (50, 95, 99)
+
+
+def percentile(sorted_samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_samples:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_samples)))
+    return sorted_samples[rank - 1]
+
+
+class Recorder:
+    """Collects latencies and failures per route label"""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self.enabled = True
+
+    def record(self, route: str, seconds: float, error: str = None) -> None:
+        if not self.enabled:
+            return
+        if error is None:
+            self.latencies[route].append(seconds)
+        else:
+            self.errors[route][error] += 1
+
+    def summary(self, duration: float) -> dict:
+        routes = {}
+        for route in sorted(set(self.latencies) | set(self.errors)):
+            routes[route] = summarize(self.latencies[route], dict(self.errors[route]), duration)
+        everything = [sample for samples in self.latencies.values() for sample in samples]
+        all_errors = defaultdict(int)
+        for errors in self.errors.values():
+            for error, count in errors.items():
+                all_errors[error] += count
+        return {"routes": routes, "total": summarize(everything, dict(all_errors), duration)}
+
+
+def summarize(samples: List[float], errors: Dict[str, int], duration: float) -> dict:
+    samples = sorted(samples)
+    result = {
+        "requests": len(samples),
+        "errors": sum(errors.values()),
+        "error_kinds": errors,
+        "rps": round(len(samples) / duration, 2) if duration else 0.0,
+        "mean_ms": round(sum(samples) / len(samples) * 1000, 3) if samples else 0.0,
+    }
+    for pct in PERCENTILES:
+        result[f"p{pct}_ms"] = round(percentile(samples, pct) * 1000, 3)
+    return result
@@ -0,0 +1,61 @@
+"""
+Script to bulk import historical meal logs for one user
+
+Usage:
+    python scripts/import_meals.py --email user@example.com meals.csv [--format ndjson] [--batch-size 10000]
+
+Accepts the same CSV / NDJSON files as POST /meals/import (including files
+produced by GET /meals/export). Rows that fail validation are skipped and
+listed by line number.
+"""
+import argparse
+import sys
+import os
+import time
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import SessionLocal
+from app.models.user import User
+from app.utils.meal_import import IMPORT_BATCH_SIZE, IMPORT_FORMATS, import_format, import_meals_file
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk import meal logs for one user")
+    parser.add_argument("file", help="CSV or NDJSON file to import")
+    parser.add_argument("--email", required=True, help="Email of the user the meals belong to")
+    parser.add_argument("--format", choices=IMPORT_FORMATS, default=None, help="Defaults to the file extension")
+    parser.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        user = db.query(User).filter(User.email == args.email).first()
+    finally:
+        db.close()
+    if user is None:
+        print(f"❌ No user with email {args.email}")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    try:
+        with open(args.file, "rb") as f:
+            result = import_meals_file(f, import_format(args.file, args.format), user.id, args.batch_size)
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+    elapsed = time.perf_counter() - start
+
+    for error in result["errors"]:
+        print(f"Line {error['line']}: {error['error']}")
+    if result["errors_truncated"]:
+        print(f"... and {result['failed'] - len(result['errors'])} more rejected rows")
+
+    rate = result["imported"] / max(elapsed, 1e-9)
+    print(f"✅ Imported {result['imported']} meals ({result['failed']} rejected) "
+          f"in {elapsed:.2f}s ({rate:,.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Script to create or upgrade the database schema
+Run this before starting the API for the first time, and after each deploy
+
+Usage:
+    python scripts/init_db.py           # create missing tables and indexes, make foods.name unique
+    python scripts/init_db.py --check   # report what is missing (exit 1 if anything)
+    python scripts/init_db.py --seed    # also load the bundled food catalog
+"""
+import argparse
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import SessionLocal, engine
+from app.utils.food_loader import iter_food_rows, load_foods
+from app.utils.schema import init_schema, missing_schema
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Create or upgrade the database schema")
+    parser.add_argument("--check", action="store_true", help="Only report missing or non-unique tables and indexes")
+    parser.add_argument("--seed", action="store_true", help="Load the bundled food catalog afterwards")
+    args = parser.parse_args()
+
+    try:
+        if args.check:
+            missing = missing_schema(engine)
+            for name in missing:
+                print(f"Missing: {name}")
+            print(f"{len(missing)} tables or indexes missing or out of date")
+            sys.exit(1 if missing else 0)
+
+        created = init_schema(engine)
+        for name in created:
+            print(f"Created: {name}")
+        print(f"✅ Schema up to date ({len(created)} tables or indexes created or upgraded)")
+
+        if args.seed:
+            db = SessionLocal()
+            try:
+                result = load_foods(db, iter_food_rows())
+            finally:
+                db.close()
+            print(f"✅ Loaded {result['written']} new foods")
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Script to summarize nutrition over a date range for every user (or one)
+
+Usage:
+    python scripts/nutrition_report.py --from 2024-01-01 --to 2024-12-31 [--email user@example.com] [--window 7]
+
+Prints, per user, the average of each macro over logged days, the latest
+rolling average and the 10th/50th/90th percentile of daily totals. Needs
+numpy; the work is done by app.utils.analytics over the whole range at once.
+"""
+import argparse
+import sys
+import os
+import time
+from datetime import date
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from app.database import SessionLocal
+from app.models.user import User
+from app.utils.analytics import (
+    DEFAULT_PERCENTILES, daily_percentiles, daily_totals, load_meal_arrays, nutrient_matrix, rolling_mean,
+)
+from app.utils.rollups import MACRO_COLUMNS
+
+
+def format_row(label: str, values) -> str:
+    return f"  {label:<14}" + "".join(f"{value:>12.1f}" for value in values)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Nutrition summary over a date range")
+    parser.add_argument("--from", dest="start", type=date.fromisoformat, required=True, help="First day (YYYY-MM-DD)")
+    parser.add_argument("--to", dest="end", type=date.fromisoformat, required=True, help="Last day, inclusive")
+    parser.add_argument("--email", default=None, help="Limit to a single user")
+    parser.add_argument("--window", type=int, default=7, help="Days in the rolling average")
+    args = parser.parse_args()
+    if args.end < args.start:
+        print("❌ --to is before --from")
+        sys.exit(1)
+
+    db = SessionLocal()
+    try:
+        user_ids = None
+        if args.email:
+            user = db.query(User).filter(User.email == args.email).first()
+            if user is None:
+                print(f"❌ No user with email {args.email}")
+                sys.exit(1)
+            user_ids = [user.id]
+
+        start = time.perf_counter()
+        meals = load_meal_arrays(db, args.start, args.end, user_ids)
+        matrix = nutrient_matrix.get(db)
+        loaded = time.perf_counter() - start
+        emails = dict(db.query(User.id, User.email).filter(User.id.in_(np.unique(meals.user_id).tolist())).all())
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+    finally:
+        db.close()
+
+    start = time.perf_counter()
+    daily = daily_totals(meals, matrix, args.start, args.end)
+    rolling = rolling_mean(daily.totals, args.window)
+    percentiles = daily_percentiles(daily)
+    computed = time.perf_counter() - start
+
+    logged_days = (daily.meal_counts > 0).sum(axis=1)
+    averages = daily.totals.sum(axis=1) / np.maximum(logged_days, 1)[:, None]
+    header = f"  {'':<14}" + "".join(f"{column:>12}" for column in MACRO_COLUMNS)
+    for index, user_id in enumerate(daily.user_ids.tolist()):
+        print(f"\n{emails.get(user_id, user_id)}: {daily.meal_counts[index].sum()} meals "
+              f"on {logged_days[index]} of {len(daily.days)} days")
+        print(header)
+        print(format_row("daily average", averages[index]))
+        print(format_row(f"last {args.window}d avg", rolling[index, -1]))
+        for pct, values in zip(DEFAULT_PERCENTILES, percentiles[index]):
+            print(format_row(f"p{pct}", values))
+
+    print(f"\n✅ {len(meals.quantity):,} meals for {len(daily.user_ids)} users: "
+          f"loaded in {loaded:.2f}s, summarized in {computed * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
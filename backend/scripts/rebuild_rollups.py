@@ -0,0 +1,45 @@
+"""
+Script to regenerate the daily_nutrition_totals rollup table from meals
+Run this after deploying the rollup table, or with --check to look for drift
+"""
+import argparse
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import SessionLocal
+from app.utils.rollups import find_rollup_drift, rebuild_rollups
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild or verify daily nutrition rollups")
+    parser.add_argument("--check", action="store_true", help="Only report drift, don't rewrite anything")
+    parser.add_argument("--user-id", type=int, default=None, help="Limit to a single user")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        drift = find_rollup_drift(db, args.user_id)
+        for entry in drift:
+            user_id, day, meal_type = entry["key"]
+            print(f"Drift: user={user_id} day={day} meal_type={meal_type} "
+                  f"expected={entry['expected']} stored={entry['stored']}")
+        print(f"{len(drift)} rollup rows out of date")
+
+        if args.check:
+            sys.exit(1 if drift else 0)
+
+        rows = rebuild_rollups(db, args.user_id)
+        print(f"✅ Rebuilt {rows} rollup rows")
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        db.rollback()
+        sys.exit(1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -50,6 +50,25 @@ export interface DayStats {
     };
 }
 
+export interface DayTotals {
+    day: string;
+    total_calories: number;
+    total_protein: number;
+    total_carbs: number;
+    total_fats: number;
+    daily_goal: number;
+    remaining_calories: number;
+}
+
+export interface LoggedMeal extends Meal {
+    totals: DayTotals;
+}
+
+export interface TodayDashboard {
+    meals: Meal[];
+    stats: DayStats;
+}
+
 export interface UserProfile {
     id: number;
     email: string;
@@ -222,12 +241,13 @@ export async function searchFoods(query: string): Promise<Food[]> {
 // Meals API
 // =============================================================================
 
+// Returns the day's updated totals too, so callers don't need to refetch stats
 export async function logMeal(
     foodId: number,
     mealType: "breakfast" | "lunch" | "dinner" | "snacks",
     quantity: number = 1
-): Promise<Meal> {
-    return apiRequest<Meal>("/meals", {
+): Promise<LoggedMeal> {
+    return apiRequest<LoggedMeal>("/meals?include_totals=true", {
         method: "POST",
         body: JSON.stringify({
             food_id: foodId,
@@ -245,8 +265,12 @@ export async function getTodayStats(): Promise<DayStats> {
     return apiRequest<DayStats>("/meals/stats/today");
 }
 
-export async function deleteMeal(mealId: number): Promise<void> {
-    await apiRequest<void>(`/meals/${mealId}`, {
+export async function getTodayDashboard(): Promise<TodayDashboard> {
+    return apiRequest<TodayDashboard>("/meals/dashboard/today");
+}
+
+export async function deleteMeal(mealId: number): Promise<DayTotals> {
+    return apiRequest<DayTotals>(`/meals/${mealId}?include_totals=true`, {
         method: "DELETE",
     });
 }
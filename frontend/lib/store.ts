@@ -2,7 +2,7 @@
 
 import { create } from "zustand";
 import * as api from "./api";
-import type { Food, Meal, DayStats, UserProfile as BackendUserProfile } from "./api";
+import type { Food, Meal, DayStats, DayTotals, UserProfile as BackendUserProfile } from "./api";
 
 // =============================================================================
 // Types
@@ -173,6 +173,45 @@ function mealToFoodEntry(meal: Meal): FoodEntry {
   };
 }
 
+// Fold the totals returned by a meal write into today's stats, adding or
+// removing the meal in meals_by_type, instead of refetching the dashboard
+function applyDayTotals(
+  stats: DayStats | null,
+  totals: DayTotals,
+  change: { added: Meal } | { removedId: number }
+): DayStats | null {
+  if (!stats) return null;
+
+  const mealsByType = { ...stats.meals_by_type };
+  if ("added" in change) {
+    const meal = change.added;
+    mealsByType[meal.meal_type] = [
+      ...mealsByType[meal.meal_type],
+      {
+        id: meal.id,
+        food_name: meal.food.name,
+        quantity: meal.quantity,
+        unit: meal.food.unit_type,
+        calories: meal.total_calories,
+      },
+    ];
+  } else {
+    for (const type of Object.keys(mealsByType) as Array<keyof DayStats["meals_by_type"]>) {
+      mealsByType[type] = mealsByType[type].filter((m) => m.id !== change.removedId);
+    }
+  }
+
+  return {
+    total_calories: totals.total_calories,
+    total_protein: totals.total_protein,
+    total_carbs: totals.total_carbs,
+    total_fats: totals.total_fats,
+    daily_goal: totals.daily_goal,
+    remaining_calories: totals.remaining_calories,
+    meals_by_type: mealsByType,
+  };
+}
+
 // =============================================================================
 // Store
 // =============================================================================
@@ -355,10 +394,8 @@ export const useAppStore = create<AppState>((set, get) => ({
     set({ isLoading: true, error: null });
 
     try {
-      const [meals, stats] = await Promise.all([
-        api.getTodayMeals(),
-        api.getTodayStats(),
-      ]);
+      // One request (one auth check, one query) for the whole home screen
+      const { meals, stats } = await api.getTodayDashboard();
 
       // Convert backend meals to local entries
       const entries = meals.map(mealToFoodEntry);
@@ -382,18 +419,17 @@ export const useAppStore = create<AppState>((set, get) => ({
     set({ isLoading: true, error: null });
 
     try {
-      const meal = await api.logMeal(foodId, mealType, quantity);
+      const { totals, ...meal } = await api.logMeal(foodId, mealType, quantity);
       const entry = mealToFoodEntry(meal);
 
+      // The response carries the updated totals, so no refetch is needed
       set((state) => ({
         todayMeals: [...state.todayMeals, meal],
+        todayStats: applyDayTotals(state.todayStats, totals, { added: meal }),
         todayEntries: [...state.todayEntries, entry],
         currentScreen: "home",
         isLoading: false,
       }));
-
-      // Refresh stats
-      get().fetchTodayData();
     } catch (err) {
       const error = err as api.ApiError;
       set({
@@ -408,16 +444,14 @@ export const useAppStore = create<AppState>((set, get) => ({
     set({ isLoading: true, error: null });
 
     try {
-      await api.deleteMeal(mealId);
+      const totals = await api.deleteMeal(mealId);
 
       set((state) => ({
         todayMeals: state.todayMeals.filter((m) => m.id !== mealId),
+        todayStats: applyDayTotals(state.todayStats, totals, { removedId: mealId }),
         todayEntries: state.todayEntries.filter((e) => e.backendMealId !== mealId),
         isLoading: false,
       }));
-
-      // Refresh stats
-      get().fetchTodayData();
     } catch (err) {
       const error = err as api.ApiError;
       set({